@@ -0,0 +1,55 @@
+"""Batched INSERT (`create_many`) vs COPY (`bulk_load`) for lessons.
+
+On PostgreSQL `bulk_load` uses asyncpg's binary COPY, on SQLite it falls back to batched
+inserts, so both columns should be close there:
+
+    DB_HOST=... DB_PORT=... DB_NAME=... DB_USER=... DB_PWD=... python -m benchmarks.bench_bulk_load
+    IS_TEST=true DATABASE_URL=sqlite+aiosqlite:///bench.db python -m benchmarks.bench_bulk_load
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+
+from src.db import Base, engine
+from src.db import Lesson as LessonTable
+from src.db.database import async_session
+from src.objects import Lesson
+
+
+async def run(rows_amount: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    start_date = datetime(1990, 1, 1)
+    payload = [
+        {"is_group": i % 3 == 0, "date": start_date + timedelta(minutes=i)}
+        for i in range(rows_amount)
+    ]
+
+    print(f"{engine.dialect.name}: {rows_amount} lessons")
+    for name, method in (("create_many", Lesson.create_many), ("bulk_load", Lesson.bulk_load)):
+        async with async_session() as session:
+            started = time.perf_counter()
+            await method(session, payload)
+            elapsed = time.perf_counter() - started
+
+            await session.execute(
+                delete(LessonTable).where(LessonTable.date < datetime(2000, 1, 1)),
+            )
+            await session.commit()
+
+        print(f"  {name:>12}: {elapsed:8.3f}s {rows_amount / elapsed:12.0f} rows/s")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows))
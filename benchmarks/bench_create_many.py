@@ -0,0 +1,56 @@
+r"""Throughput of `create_many` depending on the number of rows per INSERT.
+
+The engine is configured the same way as the application:
+
+    IS_TEST=true DATABASE_URL=sqlite+aiosqlite:///bench.db python -m benchmarks.bench_create_many
+    DB_HOST=... DB_PORT=... DB_NAME=... DB_USER=... DB_PWD=... \
+        python -m benchmarks.bench_create_many
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+
+from src.db import Base, engine
+from src.db import Lesson as LessonTable
+from src.db.database import async_session
+from src.objects import Lesson
+
+
+async def run(rows_amount: int, batch_sizes: list[int]) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    start_date = datetime(2000, 1, 1)
+    payload = [
+        {"is_group": i % 3 == 0, "date": (start_date + timedelta(hours=i)).isoformat()}
+        for i in range(rows_amount)
+    ]
+
+    print(f"{engine.dialect.name}: {rows_amount} lessons")
+    for batch_size in batch_sizes:
+        Lesson._bulk_chunk_size = batch_size
+
+        async with async_session() as session:
+            started = time.perf_counter()
+            created_ids = (await Lesson.create_many(session, payload))["created_ids"]
+            elapsed = time.perf_counter() - started
+
+            await session.execute(delete(LessonTable).where(LessonTable.id.in_(created_ids)))
+            await session.commit()
+
+        print(f"  batch {batch_size:>6}: {elapsed:8.3f}s {rows_amount / elapsed:12.0f} rows/s")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.batch_sizes))
@@ -0,0 +1,90 @@
+"""Paging and export of lessons with JSON rendered in Python vs by PostgreSQL.
+
+`render=db` only changes anything on PostgreSQL, on SQLite both rows should match:
+
+    DB_HOST=... DB_PORT=... DB_NAME=... DB_USER=... DB_PWD=... python -m benchmarks.bench_db_json
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import orjson
+from sqlalchemy import delete
+
+from src.db import Base, engine
+from src.db import Lesson as LessonTable
+from src.db.database import async_session
+from src.objects import GetParamsModel, Lesson
+
+
+async def read_pages(render: str, page_size: int) -> int:
+    rows_amount = 0
+    cursor = None
+    async with async_session() as session:
+        while True:
+            params = GetParamsModel(limit=page_size, cursor=cursor, render=render)
+            page = await Lesson.get(session, {"date": {"lt": "2000-01-01T00:00:00"}}, params)
+            # Encoding is part of the response cost, so it is measured too
+            rows_amount += len(orjson.loads(orjson.dumps(page["items"])))
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return rows_amount
+
+
+async def export(render: str) -> int:
+    size = 0
+    async with async_session() as session:
+        chunks = Lesson.export(
+            session,
+            {"date": {"lt": "2000-01-01T00:00:00"}},
+            None,
+            "ndjson",
+            render,
+        )
+        async for chunk in chunks:
+            size += len(chunk)
+    return size
+
+
+async def run(rows_amount: int, page_size: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    start_date = datetime(1990, 1, 1)
+    async with async_session() as session:
+        await Lesson.bulk_load(
+            session,
+            [
+                {"is_group": i % 3 == 0, "date": start_date + timedelta(minutes=i)}
+                for i in range(rows_amount)
+            ],
+        )
+
+    print(f"{engine.dialect.name}: {rows_amount} lessons, pages of {page_size}")
+    for render in ("python", "db"):
+        started = time.perf_counter()
+        await read_pages(render, page_size)
+        elapsed = time.perf_counter() - started
+        print(f"  {'get ' + render:>12}: {elapsed:8.3f}s {rows_amount / elapsed:12.0f} rows/s")
+
+        started = time.perf_counter()
+        await export(render)
+        elapsed = time.perf_counter() - started
+        print(f"  {'export ' + render:>12}: {elapsed:8.3f}s {rows_amount / elapsed:12.0f} rows/s")
+
+    async with async_session() as session:
+        await session.execute(delete(LessonTable).where(LessonTable.date < datetime(2000, 1, 1)))
+        await session.commit()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.page_size))
@@ -0,0 +1,164 @@
+"""Latency of the salary ledger: recomputing its cells from the lessons and reading salaries.
+
+Generated lessons are spread over 1990, so they don't mix with real data:
+
+    DB_HOST=... DB_PORT=... DB_NAME=... DB_USER=... DB_PWD=... python -m benchmarks.bench_salary
+    IS_TEST=true python -m benchmarks.bench_salary
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db import Base, engine
+from src.db import Customer as CustomerTable
+from src.db import Dog as DogTable
+from src.db import Lesson as LessonTable
+from src.db import LessonDog as LessonDogTable
+from src.db import LessonStaff as LessonStaffTable
+from src.db import Staff as StaffTable
+from src.db import StaffStatus as StaffStatusTable
+from src.db.database import async_session
+from src.objects import salary_ledger
+
+START_DATE = date(1990, 1, 1)
+END_DATE = date(1991, 1, 1)
+MONTH = (date(1990, 6, 1), date(1990, 7, 1))
+DAY = "1990-06-15"
+CHUNK_SIZE = 1000
+
+
+async def populate(lessons_amount: int, staff_amount: int, dogs_amount: int) -> dict[str, Any]:
+    random.seed(0)
+    async with async_session() as session:
+        status = StaffStatusTable(
+            name="bench",
+            big_dog_price=1000,
+            low_dog_price=800,
+            group_price=400,
+        )
+        customer = CustomerTable(name="bench")
+        session.add_all([status, customer])
+        await session.flush()
+
+        staff = [
+            StaffTable(name=f"bench {i}", tg_id=i, status=status.id) for i in range(staff_amount)
+        ]
+        dogs = [
+            DogTable(name=f"bench {i}", breed="bench", owner=customer.id, is_big=i % 2 == 0)
+            for i in range(dogs_amount)
+        ]
+        session.add_all(staff + dogs)
+        await session.flush()
+        staff_ids = [elem.id for elem in staff]
+        dog_ids = [elem.id for elem in dogs]
+
+        seconds = int((END_DATE - START_DATE).total_seconds())
+        lessons = [
+            {
+                "is_group": i % 5 == 0,
+                "date": datetime(1990, 1, 1) + timedelta(seconds=random.randrange(seconds)),
+            }
+            for i in range(lessons_amount)
+        ]
+        lesson_ids = []
+        for start in range(0, lessons_amount, CHUNK_SIZE):
+            lesson_ids += await session.scalars(
+                LessonTable.__table__.insert()
+                .returning(LessonTable.id)
+                .values(lessons[start : start + CHUNK_SIZE]),
+            )
+
+        lesson_staff, lesson_dog = [], []
+        for i, lesson_id in enumerate(lesson_ids):
+            lesson_staff.append({"lesson_id": lesson_id, "staff_id": random.choice(staff_ids)})
+            dogs_in_lesson = random.sample(dog_ids, 4) if i % 5 == 0 else [random.choice(dog_ids)]
+            lesson_dog += [{"lesson_id": lesson_id, "dog_id": dog_id} for dog_id in dogs_in_lesson]
+        await session.execute(LessonStaffTable.__table__.insert(), lesson_staff)
+        await session.execute(LessonDogTable.__table__.insert(), lesson_dog)
+        await session.commit()
+
+    return {"status": status.id, "customer": customer.id, "staff": staff_ids}
+
+
+async def cleanup(ids: dict[str, Any]) -> None:
+    async with async_session() as session:
+        lessons = select(LessonTable.id).where(LessonTable.date < datetime(2000, 1, 1))
+        await session.execute(
+            delete(LessonStaffTable).where(LessonStaffTable.lesson_id.in_(lessons)),
+        )
+        await session.execute(delete(LessonDogTable).where(LessonDogTable.lesson_id.in_(lessons)))
+        await session.execute(delete(LessonTable).where(LessonTable.date < datetime(2000, 1, 1)))
+        await session.execute(delete(StaffTable).where(StaffTable.id.in_(ids["staff"])))
+        await session.execute(delete(DogTable).where(DogTable.owner == ids["customer"]))
+        await session.execute(delete(CustomerTable).where(CustomerTable.id == ids["customer"]))
+        await session.execute(delete(StaffStatusTable).where(StaffStatusTable.id == ids["status"]))
+        await salary_ledger.rebuild(session)
+        await session.commit()
+
+
+async def rebuild(session: AsyncSession) -> None:
+    await salary_ledger.rebuild(session)
+    await session.commit()
+
+
+async def measure(name: str, repeat: int, method: Callable[[Any], Awaitable[Any]]) -> None:
+    async with async_session() as session:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            await method(session)
+        elapsed = time.perf_counter() - started
+    print(f"  {name:>24}: {elapsed / repeat * 1000:10.2f} ms")
+
+
+async def run(lessons_amount: int, staff_amount: int, dogs_amount: int, repeat: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    ids = await populate(lessons_amount, staff_amount, dogs_amount)
+    staff_id = ids["staff"][0]
+    print(f"{engine.dialect.name}: {lessons_amount} lessons, {staff_amount} staff")
+    try:
+        await measure("ledger rebuild", 1, rebuild)
+        # Refreshes run the Core aggregate of the lessons, the way writes do
+        await measure(
+            "refresh, one staff day",
+            repeat,
+            lambda session: salary_ledger.refresh(session, [[staff_id, DAY]]),
+        )
+        await measure(
+            "refresh, one staff",
+            repeat,
+            lambda session: salary_ledger.refresh(session, [[staff_id, None]]),
+        )
+        await measure(
+            "ledger, one staff",
+            repeat,
+            lambda session: salary_ledger.get_amount(session, staff_id, *MONTH),
+        )
+        await measure(
+            "ledger, every staff",
+            repeat,
+            lambda session: session.execute(salary_ledger.report_query(*MONTH)),
+        )
+    finally:
+        await cleanup(ids)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lessons", type=int, default=200_000)
+    parser.add_argument("--staff", type=int, default=30)
+    parser.add_argument("--dogs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.lessons, args.staff, args.dogs, args.repeat))
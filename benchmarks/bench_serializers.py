@@ -0,0 +1,49 @@
+"""Rows/s of the precomputed row serializers against building dicts from ORM entities.
+
+IS_TEST=true python -m benchmarks.bench_serializers
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from src.db import Lesson as LessonTable
+from src.db import table_serializers
+
+
+def measure(name: str, rows_amount: int, func: Callable[[], Any]) -> None:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"  {name:>22}: {elapsed:8.3f}s {rows_amount / elapsed:12.0f} rows/s")
+
+
+def run(rows_amount: int) -> None:
+    start_date = datetime(2000, 1, 1)
+    rows = [(i, i % 3 == 0, start_date + timedelta(hours=i)) for i in range(rows_amount)]
+    entities = [LessonTable(id=i, is_group=is_group, date=date) for i, is_group, date in rows]
+    names = tuple(LessonTable.__table__.columns.keys())
+    serialize = table_serializers[LessonTable.__tablename__]
+
+    print(f"{rows_amount} lessons")
+    measure(
+        "ORM entity",
+        rows_amount,
+        lambda: [{name: getattr(row, name) for name in names} for row in entities],
+    )
+    measure(
+        "dict(zip(...))",
+        rows_amount,
+        lambda: [dict(zip(names, row, strict=True)) for row in rows],
+    )
+    measure("row serializer", rows_amount, lambda: [serialize(row) for row in rows])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    run(args.rows)
@@ -0,0 +1,72 @@
+"""Rows/s of validating bulk payloads into insert-ready dicts.
+
+Compares a model per row, one list adapter of models dumped back to dicts, and
+`validate_many`, which validates into TypedDict rows without model instances:
+
+    IS_TEST=true python -m benchmarks.bench_validation
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+from pydantic import TypeAdapter
+
+from src.objects.abstract_object import validate_many
+from src.objects.dogs import DogModel
+
+
+def measure(name: str, rows_amount: int, func: Callable[[], Any]) -> None:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"  {name:>26}: {elapsed:8.3f}s {rows_amount / elapsed:12.0f} rows/s")
+
+
+def model_per_row(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        DogModel.model_validate(row).model_dump(exclude_none=True, exclude={"id"}) for row in data
+    ]
+
+
+def models_dumped(
+    adapter: TypeAdapter[list[DogModel]],
+    data: list[dict[str, Any]] | bytes,
+) -> list[dict[str, Any]]:
+    if isinstance(data, bytes):
+        models = adapter.validate_json(data)
+    else:
+        models = adapter.validate_python(data)
+    rows = adapter.dump_python(models)
+    for row in rows:
+        if row.get("id", 0) is None:
+            del row["id"]
+    return rows
+
+
+def run(rows_amount: int) -> None:
+    data = [
+        {"name": f"dog {i}", "breed": "bench", "owner": i % 100 + 1, "is_big": i % 2 == 0}
+        for i in range(rows_amount)
+    ]
+    body = orjson.dumps(data)
+    adapter = TypeAdapter(list[DogModel])
+    # The first call builds and caches the row adapter
+    validate_many(DogModel, data[:1])
+
+    print(f"{rows_amount} dogs")
+    measure("model per row, dicts", rows_amount, lambda: model_per_row(data))
+    measure("list of models, dicts", rows_amount, lambda: models_dumped(adapter, data))
+    measure("validate_many, dicts", rows_amount, lambda: validate_many(DogModel, data))
+    measure("list of models, JSON", rows_amount, lambda: models_dumped(adapter, body))
+    measure("validate_many, JSON", rows_amount, lambda: validate_many(DogModel, body))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    run(args.rows)
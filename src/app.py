@@ -5,23 +5,39 @@ from fastapi import FastAPI, Request
 from fastapi.responses import ORJSONResponse
 
 from .config import MODULE_NAME
-from .db import Base, engine
+from .db import engine
+from .db.database import async_session
+from .db.migrations import MIGRATIONS, migrate
 from .exceptions import PesopolistException
 from .log import logger
-from .routes import object_router, report_router
+from .objects.invalidation import create_listener
+from .objects.reference import reference_data
+from .routes import lesson_router, object_router, report_router, stats_router
 
 
 def create_application() -> FastAPI:
     application = FastAPI()
-    application.include_router(object_router, prefix=f"/{MODULE_NAME}")
+    application.include_router(lesson_router, prefix=f"/{MODULE_NAME}")
+    application.include_router(stats_router, prefix=f"/{MODULE_NAME}")
     application.include_router(report_router, prefix=f"/{MODULE_NAME}")
+    application.include_router(object_router, prefix=f"/{MODULE_NAME}")
 
     return application
 
 
+async def load_reference_data() -> None:
+    async with async_session() as session:
+        await reference_data.get(session)
+
+
 async def main(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await migrate(engine, MIGRATIONS)
+
+    # Each worker listens for cache invalidations on its own connection
+    listener = create_listener(engine.url)
+    app.add_event_handler("startup", listener.start)
+    app.add_event_handler("shutdown", listener.stop)
+    app.add_event_handler("startup", load_reference_data)
 
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
@@ -42,6 +58,9 @@ async def main(app: FastAPI):
 
         return response
 
+    # The pooled connections belong to this one-shot loop, uvicorn's loop opens its own
+    await engine.dispose()
+
 
 if __name__ == "src.app":
     app = create_application()
@@ -0,0 +1,44 @@
+"""Maintenance of the salary ledger.
+
+python -m src.commands.salary_ledger rebuild
+python -m src.commands.salary_ledger check
+"""
+
+import argparse
+import asyncio
+import sys
+
+import orjson
+
+from src.db.database import async_session
+from src.objects import salary_ledger
+
+
+async def rebuild() -> int:
+    async with async_session() as session:
+        await salary_ledger.rebuild(session)
+        await session.commit()
+    return 0
+
+
+async def check() -> int:
+    async with async_session() as session:
+        mismatches = await salary_ledger.check(session)
+
+    for mismatch in mismatches:
+        # One JSON object per line on stdout, so the output can be piped
+        sys.stdout.buffer.write(orjson.dumps(mismatch, option=orjson.OPT_APPEND_NEWLINE))
+    return 1 if mismatches else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("rebuild", "check"))
+    args = parser.parse_args()
+
+    command = rebuild if args.command == "rebuild" else check
+    sys.exit(asyncio.run(command()))
+
+
+if __name__ == "__main__":
+    main()
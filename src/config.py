@@ -20,3 +20,12 @@ IS_TEST = env.get("IS_TEST", "").lower() == "true"
 TEST_DATABASE_URL = env.get("DATABASE_URL") or "sqlite+aiosqlite:///my_database.db"
 
 LOG_LEVEL = env.get("LOG_LEVEL") or "INFO"
+
+BULK_CHUNK_SIZE = int(env.get("BULK_CHUNK_SIZE") or 1000)
+DEFAULT_PAGE_SIZE = int(env.get("DEFAULT_PAGE_SIZE") or 100)
+MAX_PAGE_SIZE = int(env.get("MAX_PAGE_SIZE") or 1000)
+
+OBJECT_CACHE_SIZE = int(env.get("OBJECT_CACHE_SIZE") or 10000)
+OBJECT_CACHE_TTL = float(env.get("OBJECT_CACHE_TTL") or 60)
+CACHE_INVALIDATION_CHANNEL = env.get("CACHE_INVALIDATION_CHANNEL") or f"{MODULE_NAME}_invalidation"
+REPORT_CACHE_SIZE = int(env.get("REPORT_CACHE_SIZE") or 10000)
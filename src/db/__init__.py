@@ -8,6 +8,8 @@ from .models import (
     Lesson,
     LessonDog,
     LessonStaff,
+    SalaryLedger,
     Staff,
     StaffStatus,
 )
+from .serializers import RowSerializer, row_serializer, table_serializers
@@ -0,0 +1,2 @@
+from .runner import Migration, migrate, schema_migrations
+from .versions import MIGRATIONS
@@ -0,0 +1,208 @@
+"""Tables of the baseline migration, frozen as the models declared them at its release.
+
+Later changes of the models must not change what the baseline creates, they come with
+their own migrations instead.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import MONEY
+
+from src.config import IS_TEST
+
+money_type = Float if IS_TEST else MONEY
+
+metadata = MetaData()
+
+
+def _id(comment: str) -> Column[int]:
+    return Column("id", Integer, primary_key=True, autoincrement=True, comment=comment)
+
+
+administrators = Table(
+    "administrators",
+    metadata,
+    _id("id администратора"),
+    Column("name", String(255), nullable=False, comment="Имя администратора"),
+    Column("phone", String(30), comment="Телефон администратора"),
+    Column("tg_id", Integer, nullable=False, comment="id телеграм аккаунта администратора"),
+    Index("ix_administrators_tg_id", "tg_id"),
+)
+
+courses = Table(
+    "courses",
+    metadata,
+    _id("id курса"),
+    Column("name", String(255), nullable=False, comment="Название курса"),
+    Column("lessons_amount", Integer, nullable=False, comment="Количество занятий в курсе"),
+    Column("price", money_type, nullable=False, comment="Цена курса"),
+)
+
+courses_to_dogs = Table(
+    "courses_to_dogs",
+    metadata,
+    _id("id связи собак с курсами"),
+    Column(
+        "dog_id",
+        ForeignKey("dogs.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="id собаки",
+    ),
+    Column(
+        "course_id",
+        ForeignKey("courses.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="id курса",
+    ),
+    Index("ix_courses_to_dogs_dog_id_course_id", "dog_id", "course_id"),
+    Index("ix_courses_to_dogs_course_id", "course_id"),
+)
+
+customers = Table(
+    "customers",
+    metadata,
+    _id("id клиента"),
+    Column("name", String(255), nullable=False, comment="Имя клиента"),
+    Column("phone", String(30), comment="Телефон клиента"),
+    Column("tg_id", Integer, comment="id тегерам аккаунта клиента"),
+    Index("ix_customers_tg_id", "tg_id"),
+)
+
+dogs = Table(
+    "dogs",
+    metadata,
+    _id("id собаки"),
+    Column("name", String(255), nullable=False, comment="Кличка собаки"),
+    Column("breed", String(255), nullable=False, comment="Порода собаки"),
+    Column(
+        "owner",
+        ForeignKey("customers.id", ondelete="CASCADE", comment="id хозяина собаки"),
+        nullable=False,
+    ),
+    Column("is_big", Boolean, nullable=False, comment="Является ли собака большой"),
+    Column("is_active", Boolean, nullable=False, comment="Занимается ли сейчас собака"),
+    Index("ix_dogs_owner", "owner"),
+)
+
+staffs = Table(
+    "staffs",
+    metadata,
+    _id("id сотрудника"),
+    Column(
+        "status",
+        ForeignKey("staff_status.id", ondelete="SET NULL"),
+        nullable=False,
+        comment="id статуса сотрудника",
+    ),
+    Column("name", String(255), nullable=False, comment="Имя сотрудника"),
+    Column("phone", String(30), comment="Номер телефона сотрудника"),
+    Column("tg_id", Integer, nullable=False, comment="id телеграм аккаунта сотрудника"),
+    Index("ix_staffs_status", "status"),
+    Index("ix_staffs_tg_id", "tg_id"),
+)
+
+staff_status = Table(
+    "staff_status",
+    metadata,
+    _id("id роли сотрудника"),
+    Column("name", String(255), nullable=False, comment="Имя роли сотрудника"),
+    Column("big_dog_price", money_type, nullable=False, comment="Цена занятия с большой собакой"),
+    Column(
+        "low_dog_price",
+        money_type,
+        nullable=False,
+        comment="Цена занятия с маленькой собакой",
+    ),
+    Column("group_price", money_type, nullable=False, comment="Цена собаки на групповом занятии"),
+)
+
+lessons = Table(
+    "lessons",
+    metadata,
+    _id("id занятия"),
+    Column("is_group", Boolean, nullable=False, comment="Является ли занятие групповым"),
+    Column("date", DateTime, nullable=False, comment="Дата и время проведения занятия"),
+    Index("ix_lessons_date", "date"),
+)
+
+lesson_staff = Table(
+    "lesson_staff",
+    metadata,
+    _id("id связи занятия с сотрудником"),
+    Column(
+        "staff_id",
+        ForeignKey("staffs.id", ondelete="SET NULL"),
+        nullable=False,
+        comment="id сотрудника",
+    ),
+    Column(
+        "lesson_id",
+        ForeignKey("lessons.id", ondelete="SET NULL"),
+        nullable=False,
+        comment="id занятия",
+    ),
+    Index("uq_lesson_staff_lesson_id_staff_id", "lesson_id", "staff_id", unique=True),
+    Index("ix_lesson_staff_staff_id_lesson_id", "staff_id", "lesson_id"),
+)
+
+lesson_dog = Table(
+    "lesson_dog",
+    metadata,
+    _id("id связи занятия с собакой"),
+    Column(
+        "dog_id",
+        ForeignKey("dogs.id", ondelete="SET NULL"),
+        nullable=False,
+        comment="id собаки",
+    ),
+    Column(
+        "lesson_id",
+        ForeignKey("lessons.id", ondelete="SET NULL"),
+        nullable=False,
+        comment="id занятия",
+    ),
+    Index("uq_lesson_dog_lesson_id_dog_id", "lesson_id", "dog_id", unique=True),
+    Index("ix_lesson_dog_dog_id", "dog_id"),
+)
+
+salary_ledger = Table(
+    "salary_ledger",
+    metadata,
+    _id("id записи о зарплате"),
+    Column(
+        "staff_id",
+        ForeignKey("staffs.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="id сотрудника",
+    ),
+    Column("day", Date, nullable=False, comment="День проведения занятий"),
+    Column("lesson_count", Integer, nullable=False, comment="Количество занятий за день"),
+    Column("group_dogs", Integer, nullable=False, comment="Собак на групповых занятиях"),
+    Column(
+        "big_dogs",
+        Integer,
+        nullable=False,
+        comment="Больших собак на индивидуальных занятиях",
+    ),
+    Column(
+        "low_dogs",
+        Integer,
+        nullable=False,
+        comment="Маленьких собак на индивидуальных занятиях",
+    ),
+    Column("amount", Numeric(12, 2, asdecimal=False), nullable=False, comment="Зарплата за день"),
+    UniqueConstraint("staff_id", "day"),
+)
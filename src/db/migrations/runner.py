@@ -0,0 +1,113 @@
+"""Applies versioned schema migrations, every worker calls `migrate` at boot.
+
+Applied versions are kept in `schema_migrations`. Workers starting together take a
+PostgreSQL advisory lock, so only one of them migrates and the others find the work done.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.log import logger
+
+# Any constant shared by the workers of the application
+MIGRATION_LOCK_ID = 7_102_915_365
+LOCK_RETRY_DELAY = 1.0
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """`upgrade` runs in a transaction unless `transactional` is false.
+
+    Non-transactional migrations get an autocommit connection, which `CREATE INDEX
+    CONCURRENTLY` requires, and must be safe to run again after a failure.
+    """
+
+    version: int
+    name: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+    transactional: bool = True
+
+
+async def _lock(conn: AsyncConnection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+
+    # Polling instead of waiting on pg_advisory_lock: a waiting session keeps a snapshot
+    # open, and CREATE INDEX CONCURRENTLY in the session holding the lock would wait for it
+    while not await conn.scalar(select(func.pg_try_advisory_lock(MIGRATION_LOCK_ID))):
+        await conn.commit()
+        logger.info("Waiting for another worker to apply migrations")
+        await asyncio.sleep(LOCK_RETRY_DELAY)
+    await conn.commit()
+
+
+async def _unlock(conn: AsyncConnection) -> None:
+    if conn.dialect.name == "postgresql":
+        await conn.execute(select(func.pg_advisory_unlock(MIGRATION_LOCK_ID)))
+        await conn.commit()
+
+
+async def _apply(engine: AsyncEngine, conn: AsyncConnection, migration: Migration) -> None:
+    logger.info(f"Applying migration {migration.version} {migration.name}")
+    if migration.transactional:
+        await migration.upgrade(conn)
+    else:
+        async with engine.connect() as ddl_conn:
+            await migration.upgrade(await ddl_conn.execution_options(isolation_level="AUTOCOMMIT"))
+
+    await conn.execute(
+        insert(schema_migrations).values(
+            version=migration.version,
+            name=migration.name,
+            applied_at=func.now(),
+        ),
+    )
+    await conn.commit()
+
+
+async def migrate(engine: AsyncEngine, migrations: Sequence[Migration]) -> list[int]:
+    """Apply the pending migrations in order and return their versions."""
+    applied_now = []
+    async with engine.connect() as conn:
+        await _lock(conn)
+        try:
+            await conn.run_sync(schema_migrations.create, checkfirst=True)
+            await conn.commit()
+
+            applied = set(await conn.scalars(select(schema_migrations.c.version)))
+            await conn.commit()
+            for migration in sorted(migrations, key=lambda elem: elem.version):
+                if migration.version in applied:
+                    continue
+                try:
+                    await _apply(engine, conn, migration)
+                except BaseException:
+                    await conn.rollback()
+                    raise
+                applied_now.append(migration.version)
+        finally:
+            await _unlock(conn)
+
+    return applied_now
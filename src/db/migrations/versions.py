@@ -0,0 +1,155 @@
+"""Schema migrations of the application, applied in the order of their versions.
+
+The baseline creates missing tables from the frozen definitions of `baseline`. Databases
+created before migrations existed already have the tables and get only what the later
+migrations add, so every later migration must also accept a database the baseline has just
+created.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import and_, delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from . import baseline
+from .runner import Migration
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    name: str
+    table: str
+    columns: tuple[str, ...]
+    unique: bool = False
+
+
+PERFORMANCE_INDEXES = (
+    IndexSpec("ix_lessons_date", "lessons", ("date",)),
+    IndexSpec(
+        "uq_lesson_staff_lesson_id_staff_id",
+        "lesson_staff",
+        ("lesson_id", "staff_id"),
+        True,
+    ),
+    IndexSpec("ix_lesson_staff_staff_id_lesson_id", "lesson_staff", ("staff_id", "lesson_id")),
+    IndexSpec("uq_lesson_dog_lesson_id_dog_id", "lesson_dog", ("lesson_id", "dog_id"), True),
+    IndexSpec("ix_lesson_dog_dog_id", "lesson_dog", ("dog_id",)),
+    IndexSpec("ix_dogs_owner", "dogs", ("owner",)),
+    IndexSpec("ix_courses_to_dogs_dog_id_course_id", "courses_to_dogs", ("dog_id", "course_id")),
+    IndexSpec("ix_courses_to_dogs_course_id", "courses_to_dogs", ("course_id",)),
+    IndexSpec("ix_staffs_status", "staffs", ("status",)),
+    IndexSpec("ix_staffs_tg_id", "staffs", ("tg_id",)),
+    IndexSpec("ix_customers_tg_id", "customers", ("tg_id",)),
+    IndexSpec("ix_administrators_tg_id", "administrators", ("tg_id",)),
+)
+
+
+async def initial_schema(conn: AsyncConnection) -> None:
+    await conn.run_sync(baseline.metadata.create_all)
+
+
+# Link tables with their unique (lesson_id, column) pair
+LINK_COLUMNS = {
+    baseline.lesson_staff.name: (baseline.lesson_staff, baseline.lesson_staff.c.staff_id),
+    baseline.lesson_dog.name: (baseline.lesson_dog, baseline.lesson_dog.c.dog_id),
+}
+
+# A snapshot of the ledger query of the application, migrations don't change with it
+REBUILD_SALARY_LEDGER = (
+    "DELETE FROM salary_ledger",
+    """
+    INSERT INTO salary_ledger
+        (staff_id, day, lesson_count, group_dogs, big_dogs, low_dogs, amount)
+    SELECT
+        ls.staff_id,
+        date(l.date),
+        COUNT(DISTINCT l.id),
+        SUM(CASE WHEN d.id IS NOT NULL AND l.is_group THEN 1 ELSE 0 END),
+        SUM(CASE WHEN d.id IS NOT NULL AND NOT l.is_group AND d.is_big THEN 1 ELSE 0 END),
+        SUM(CASE WHEN d.id IS NOT NULL AND NOT l.is_group AND NOT d.is_big THEN 1 ELSE 0 END),
+        SUM(
+            CASE
+                WHEN d.id IS NULL THEN 0
+                WHEN l.is_group THEN CAST(ss.group_price AS NUMERIC(12, 2))
+                WHEN d.is_big THEN CAST(ss.big_dog_price AS NUMERIC(12, 2))
+                ELSE CAST(ss.low_dog_price AS NUMERIC(12, 2))
+            END
+        )
+    FROM lesson_staff ls
+    JOIN lessons l ON l.id = ls.lesson_id
+    LEFT JOIN lesson_dog ld ON ld.lesson_id = l.id
+    LEFT JOIN dogs d ON d.id = ld.dog_id
+    JOIN staffs s ON s.id = ls.staff_id
+    JOIN staff_status ss ON ss.id = s.status
+    GROUP BY ls.staff_id, date(l.date)
+    """,
+)
+
+
+async def _rebuild_salary_ledger(conn: AsyncConnection) -> None:
+    if conn.dialect.name == "postgresql":
+        # Waits for the writers of the ledger, the way the application does
+        await conn.execute(text("SELECT id FROM staffs ORDER BY id FOR NO KEY UPDATE"))
+    for statement in REBUILD_SALARY_LEDGER:
+        await conn.execute(text(statement))
+
+
+async def _deduplicate(conn: AsyncConnection, table_name: str) -> int:
+    # A repeated link pays the lesson twice, the earliest one is kept
+    table, column = LINK_COLUMNS[table_name]
+    linked = and_(table.c.lesson_id.is_not(None), column.is_not(None))
+    kept = select(func.min(table.c.id)).where(linked).group_by(table.c.lesson_id, column)
+    return (await conn.execute(delete(table).where(linked, table.c.id.not_in(kept)))).rowcount
+
+
+async def deduplicate_links(conn: AsyncConnection) -> None:
+    for table_name in LINK_COLUMNS:
+        await _deduplicate(conn, table_name)
+    await _rebuild_salary_ledger(conn)
+
+
+async def _drop_index(conn: AsyncConnection, name: str) -> None:
+    concurrently = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    await conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {name}"))
+
+
+async def _create_index(conn: AsyncConnection, index: IndexSpec) -> None:
+    concurrently = ""
+    if conn.dialect.name == "postgresql":
+        concurrently = "CONCURRENTLY "
+        # A failed concurrent build leaves an invalid index that IF NOT EXISTS would keep
+        invalid = await conn.scalar(
+            text(
+                "SELECT NOT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name",
+            ),
+            {"name": index.name},
+        )
+        if invalid:
+            await _drop_index(conn, index.name)
+
+    unique = "UNIQUE " if index.unique else ""
+    await conn.execute(
+        text(
+            f"CREATE {unique}INDEX {concurrently}IF NOT EXISTS {index.name} "
+            f"ON {index.table} ({', '.join(index.columns)})",
+        ),
+    )
+
+
+async def performance_indexes(conn: AsyncConnection) -> None:
+    for index in PERFORMANCE_INDEXES:
+        if index.table in LINK_COLUMNS and index.unique:
+            # Links may have been repeated since the deduplication, the unique index
+            # would fail to build. The ledger changes in the same transaction.
+            async with conn.engine.begin() as tx_conn:
+                if await _deduplicate(tx_conn, index.table):
+                    await _rebuild_salary_ledger(tx_conn)
+        await _create_index(conn, index)
+
+
+MIGRATIONS = (
+    Migration(1, "initial_schema", initial_schema),
+    Migration(2, "deduplicate_links", deduplicate_links),
+    Migration(3, "performance_indexes", performance_indexes, transactional=False),
+)
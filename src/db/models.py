@@ -1,7 +1,6 @@
-from datetime import datetime
-from typing import Any
+from datetime import date, datetime
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, Numeric, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import MONEY
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -15,14 +14,12 @@ money_type: type[float] | type[MONEY] = float if IS_TEST else MONEY
 class AbstractTable(Base):
     __abstract__ = True
 
-    def as_dict(self) -> dict[str, Any]:
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
-
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, comment="id")
 
 
 class Administrator(AbstractTable):
     __tablename__ = "administrators"
+    __table_args__ = (Index("ix_administrators_tg_id", "tg_id"),)
 
     id: Mapped[int] = mapped_column(
         primary_key=True, autoincrement=True, comment="id администратора"
@@ -43,6 +40,10 @@ class Cource(AbstractTable):
 
 class CourseToDog(AbstractTable):
     __tablename__ = "courses_to_dogs"
+    __table_args__ = (
+        Index("ix_courses_to_dogs_dog_id_course_id", "dog_id", "course_id"),
+        Index("ix_courses_to_dogs_course_id", "course_id"),
+    )
 
     id: Mapped[int] = mapped_column(
         primary_key=True, autoincrement=True, comment="id связи собак с курсами"
@@ -57,6 +58,7 @@ class CourseToDog(AbstractTable):
 
 class Customer(AbstractTable):
     __tablename__ = "customers"
+    __table_args__ = (Index("ix_customers_tg_id", "tg_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, comment="id клиента")
     name: Mapped[str] = mapped_column(String(255), comment="Имя клиента")
@@ -66,6 +68,7 @@ class Customer(AbstractTable):
 
 class Dog(AbstractTable):
     __tablename__ = "dogs"
+    __table_args__ = (Index("ix_dogs_owner", "owner"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, comment="id собаки")
     name: Mapped[str] = mapped_column(String(255), comment="Кличка собаки")
@@ -79,6 +82,7 @@ class Dog(AbstractTable):
 
 class Staff(AbstractTable):
     __tablename__ = "staffs"
+    __table_args__ = (Index("ix_staffs_status", "status"), Index("ix_staffs_tg_id", "tg_id"))
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, comment="id сотрудника")
     status: Mapped[int] = mapped_column(
@@ -106,11 +110,16 @@ class Lesson(AbstractTable):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, comment="id занятия")
     is_group: Mapped[bool] = mapped_column(default=False, comment="Является ли занятие групповым")
-    date: Mapped[datetime] = mapped_column(comment="Дата и время проведения занятия")
+    date: Mapped[datetime] = mapped_column(index=True, comment="Дата и время проведения занятия")
 
 
 class LessonStaff(AbstractTable):
     __tablename__ = "lesson_staff"
+    __table_args__ = (
+        # A staff member is linked to a lesson once, otherwise the lesson is paid twice
+        Index("uq_lesson_staff_lesson_id_staff_id", "lesson_id", "staff_id", unique=True),
+        Index("ix_lesson_staff_staff_id_lesson_id", "staff_id", "lesson_id"),
+    )
 
     id: Mapped[int] = mapped_column(
         primary_key=True, autoincrement=True, comment="id связи занятия с сотрудником"
@@ -125,6 +134,10 @@ class LessonStaff(AbstractTable):
 
 class LessonDog(AbstractTable):
     __tablename__ = "lesson_dog"
+    __table_args__ = (
+        Index("uq_lesson_dog_lesson_id_dog_id", "lesson_id", "dog_id", unique=True),
+        Index("ix_lesson_dog_dog_id", "dog_id"),
+    )
 
     id: Mapped[int] = mapped_column(
         primary_key=True, autoincrement=True, comment="id связи занятия с собакой"
@@ -135,3 +148,27 @@ class LessonDog(AbstractTable):
     lesson_id: Mapped[int] = mapped_column(
         ForeignKey("lessons.id", ondelete="SET NULL"), comment="id занятия"
     )
+
+
+class SalaryLedger(AbstractTable):
+    __tablename__ = "salary_ledger"
+    __table_args__ = (UniqueConstraint("staff_id", "day"),)
+
+    id: Mapped[int] = mapped_column(
+        primary_key=True,
+        autoincrement=True,
+        comment="id записи о зарплате",
+    )
+    staff_id: Mapped[int] = mapped_column(
+        ForeignKey("staffs.id", ondelete="CASCADE"),
+        comment="id сотрудника",
+    )
+    day: Mapped[date] = mapped_column(comment="День проведения занятий")
+    lesson_count: Mapped[int] = mapped_column(comment="Количество занятий за день")
+    group_dogs: Mapped[int] = mapped_column(comment="Собак на групповых занятиях")
+    big_dogs: Mapped[int] = mapped_column(comment="Больших собак на индивидуальных занятиях")
+    low_dogs: Mapped[int] = mapped_column(comment="Маленьких собак на индивидуальных занятиях")
+    amount: Mapped[float] = mapped_column(
+        Numeric(12, 2, asdecimal=False),
+        comment="Зарплата за день",
+    )
@@ -0,0 +1,28 @@
+import functools
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from .database import Base
+
+RowSerializer = Callable[[Sequence[Any]], dict[str, Any]]
+
+
+@functools.cache
+def row_serializer(names: tuple[str, ...]) -> RowSerializer:
+    """Build a serializer of rows with a fixed column order, cached per column list.
+
+    A comprehension over precomputed `(index, name)` pairs is faster than
+    `dict(zip(...))` or `Row._asdict()`.
+    """
+    columns = tuple(enumerate(names))
+
+    def serialize(row: Sequence[Any]) -> dict[str, Any]:
+        return {name: row[index] for index, name in columns}
+
+    return serialize
+
+
+# Serializers for full rows of every table are built once at import
+table_serializers: dict[str, RowSerializer] = {
+    table.name: row_serializer(tuple(table.columns.keys())) for table in Base.metadata.sorted_tables
+}
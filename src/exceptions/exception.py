@@ -1,5 +1,12 @@
+from typing import Any
+
+
 class PesopolistException(Exception):
-    def __init__(self, description: str = "Unknown pesopolist error", status_code: int = 500):
+    def __init__(
+        self,
+        description: str | list[dict[str, Any]] = "Unknown pesopolist error",
+        status_code: int = 500,
+    ):
         self.description = description
         self.status_code = status_code
         super().__init__(self.description)
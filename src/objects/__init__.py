@@ -1,4 +1,9 @@
-from .abstract_object import AbstrackPesopolisObject
+from .abstract_object import (
+    AbstrackPesopolisObject,
+    FieldsList,
+    GetOneParamsModel,
+    GetParamsModel,
+)
 from .administrator import Administrator
 from .course import Course
 from .customer import Customer
@@ -1,21 +1,275 @@
+import base64
+import binascii
+import csv
+import functools
+import io
+import itertools
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Sequence
+from datetime import datetime
+from typing import Annotated, Any, ClassVar, Literal, NotRequired, ParamSpec, Required, TypeVar
 
-from pydantic import BaseModel
-from sqlalchemy import delete, insert, select
-from sqlalchemy import update as _update
+import orjson
+from asyncpg import IntegrityConstraintViolationError, PostgresError
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    create_model,
+)
+from pydantic.fields import FieldInfo
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Select,
+    Text,
+    cast,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import MONEY
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import TypedDict
 
+from src.config import BULK_CHUNK_SIZE, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.db import RowSerializer, row_serializer, table_serializers
 from src.db.models import AbstractTable
 from src.exceptions import PesopolistException
 
+from . import invalidation, salary_ledger
+from .cache import cached_tables, object_cache
+from .filters import compile_filters
+from .reference import reference_data
+from .relations import Relation, expand_items
+from .report_cache import SALARY_TOPIC, AffectedReport, ReportKeysQuery, lesson_report_keys
+from .statements import update_params, update_statements
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+# asyncpg and sqlite both cap the number of bind parameters per statement
+MAX_BIND_PARAMS = 32000
+# Import keeps counting failed lines past this, but stops reporting them
+MAX_IMPORT_ERRORS = 1000
+
+
+def _chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+async def _iter_lines(body: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    line_number = 0
+    tail = b""
+    async for chunk in body:
+        *lines, tail = (tail + chunk).split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line
+
+    if tail:
+        yield line_number + 1, tail
+
+
+def _insert_values(model_data: BaseModel) -> dict[str, Any]:
+    values = model_data.model_dump()
+    if values.get("id") is None:
+        values.pop("id", None)
+    return values
+
+
+def _annotation(field: FieldInfo) -> Any:
+    return Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+
+
+@functools.cache
+def _row_type(model_class: type[BaseModel]) -> Any:
+    """Build a TypedDict with the fields and config of `model_class`.
+
+    Pydantic validates a TypedDict straight into dicts, without building model
+    instances and dumping them back. Fields with a default are optional in it.
+    """
+    decorators = model_class.__pydantic_decorators__
+    if decorators.field_validators or decorators.model_validators:
+        # A TypedDict can't run them, the models of the objects only declare fields
+        raise TypeError(f"{model_class.__name__} has validators, rows can't skip the model")
+
+    row_type = TypedDict(  # type: ignore[misc]
+        f"{model_class.__name__}Row",
+        {
+            name: Required[_annotation(field)]
+            if field.is_required()
+            else NotRequired[_annotation(field)]
+            for name, field in model_class.model_fields.items()
+        },
+    )
+    row_type.__pydantic_config__ = model_class.model_config
+    return row_type
+
+
+@functools.cache
+def _list_adapter(model_class: type[BaseModel]) -> TypeAdapter[list[dict[str, Any]]]:
+    return TypeAdapter(list[_row_type(model_class)])  # type: ignore[misc]
+
+
+@functools.cache
+def _defaults(model_class: type[BaseModel]) -> tuple[tuple[str, FieldInfo], ...]:
+    # A missing id is left to the database
+    return tuple(
+        (name, field)
+        for name, field in model_class.model_fields.items()
+        if not field.is_required() and name != "id"
+    )
+
+
+def validate_many(
+    model_class: type[BaseModel],
+    data: list[dict[str, Any]] | bytes,
+    *,
+    exclude_unset: bool = False,
+) -> list[dict[str, Any]]:
+    """Validate a whole payload in one call into insert-ready dicts.
+
+    Raw JSON bytes are parsed by pydantic itself. Errors of all rows are reported
+    together, their `loc` starts with the row index. Defaults fill the fields a row
+    doesn't have, unless `exclude_unset` keeps only the fields the client sent.
+    """
+    adapter = _list_adapter(model_class)
+    try:
+        if isinstance(data, bytes):
+            rows = adapter.validate_json(data)
+        else:
+            rows = adapter.validate_python(data)
+    except ValidationError as e:
+        raise _validation_error(e) from None
+
+    defaults = () if exclude_unset else _defaults(model_class)
+    for row in rows:
+        for name, field in defaults:
+            if name not in row:
+                row[name] = field.get_default(call_default_factory=True)
+        if row.get("id", 0) is None:
+            del row["id"]
+    return rows
+
+
+def _validation_errors(error: ValidationError) -> list[dict[str, Any]]:
+    errors = error.errors(include_url=False, include_context=False)
+    for details in errors:
+        # Invalid JSON is reported with the raw bytes as input, they aren't serializable
+        if isinstance(details.get("input"), bytes):
+            details["input"] = details["input"].decode(errors="replace")
+    return errors
+
+
+def _validation_error(error: ValidationError) -> PesopolistException:
+    return PesopolistException(_validation_errors(error), 422)
+
+
+def _conflicts_as_errors(
+    method: Callable[P, Awaitable[T]],
+) -> Callable[P, Awaitable[T]]:
+    """Report writes violating a constraint, such as a repeated link, as a conflict."""
+
+    @functools.wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        try:
+            return await method(*args, **kwargs)
+        except IntegrityError as e:
+            raise PesopolistException(str(e.orig), 409) from None
+        except IntegrityConstraintViolationError as e:
+            # COPY goes around SQLAlchemy and raises the asyncpg error itself
+            raise PesopolistException(str(e), 409) from None
+
+    return wrapper
+
+
+def _add_import_error(report: dict[str, Any], line_number: int, error: Any) -> None:
+    report["failed"] += 1
+    if len(report["errors"]) < MAX_IMPORT_ERRORS:
+        report["errors"].append({"line": line_number, "error": error})
+
+
+@functools.cache
+def partial_model(model_class: type[BaseModel]) -> type[BaseModel]:
+    """`model_class` with every field optional, for partial updates.
+
+    Dump it with `exclude_unset=True` to get only the columns the client sent.
+    """
+    fields: dict[str, Any] = {
+        name: (_annotation(field), None) for name, field in model_class.model_fields.items()
+    }
+    return create_model(
+        f"Partial{model_class.__name__}",
+        __config__=ConfigDict(extra="forbid"),
+        **fields,
+    )
+
+
+@functools.cache
+def _partial_model_with_id(model_class: type[BaseModel]) -> type[BaseModel]:
+    return create_model(
+        f"Partial{model_class.__name__}WithId",
+        __base__=partial_model(model_class),
+        id=(int, ...),
+    )
+
+
+def _split_comma_list(value: Any) -> Any:
+    # Accept both ?fields=id,name and ?fields=id&fields=name
+    if isinstance(value, str):
+        value = [value]
+    if isinstance(value, list):
+        value = [item for elem in value for item in str(elem).split(",") if item] or None
+    return value
+
+
+FieldsList = Annotated[list[str] | None, BeforeValidator(_split_comma_list)]
+
+
+class GetOneParamsModel(BaseModel):
+    fields: FieldsList = None
+    expand: FieldsList = None
+
+
+class GetParamsModel(GetOneParamsModel):
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: str | None = None
+    ids: list[int] | None = Field(default=None, max_length=MAX_PAGE_SIZE)
+    # "db" asks PostgreSQL to render rows as JSON, other dialects ignore it
+    render: Literal["python", "db"] = "python"
+
 
 class AbstrackPesopolisObject(ABC):
     _table_class: AbstractTable
     _model_class: BaseModel
+    _bulk_chunk_size: ClassVar[int] = BULK_CHUNK_SIZE
+    # Keyset for list pagination, the last column has to be unique
+    _order_columns: ClassVar[tuple[str, ...]] = ("id",)
+    _relations: ClassVar[dict[str, Relation]] = {}
+    # Reference objects whose get_one is served from the in-process cache
+    _cacheable: ClassVar[bool] = False
+    # Tiny tables read from the reference snapshot instead of the database
+    _from_snapshot: ClassVar[bool] = False
+    # Finds the salary reports a write to the given ids (and columns) affects
+    _report_keys: ClassVar[ReportKeysQuery | None] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls._cacheable:
+            cached_tables.add(cls._table_class.__tablename__)
 
     @classmethod
     @abstractmethod
+    @_conflicts_as_errors
     async def create(
         cls,
         session: AsyncSession,
@@ -32,6 +286,9 @@ class AbstrackPesopolisObject(ABC):
                 .returning(cls._table_class.id)
             )
         ).scalar()
+        # New rows can only change what reference objects serve from memory
+        await cls._publish_rows(session, [created_id])
+        await cls._publish_reports(session, await cls._affected_reports(session, [created_id]))
 
         if not from_other_object:
             await session.commit()
@@ -40,41 +297,528 @@ class AbstrackPesopolisObject(ABC):
 
     @classmethod
     @abstractmethod
+    @_conflicts_as_errors
     async def create_many(
         cls,
         session: AsyncSession,
-        data: list[dict[str, Any]],
+        data: list[dict[str, Any]] | bytes,
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
-        created_ids = []
-        for elem in data:
-            created_ids.append((await cls.create(session, elem, True))["created_id"])
+        rows = validate_many(cls._model_class, data)
+        del data
+
+        created_ids: list[int] = []
+        for chunk in _chunked(rows, cls._chunk_size()):
+            created_ids.extend(await cls._insert_chunk(session, chunk))
+        await cls._publish_rows(session, created_ids)
+        await cls._publish_reports(session, await cls._affected_reports(session, created_ids))
 
         if not from_other_object:
             await session.commit()
 
         return {"created_ids": created_ids}
 
+    @classmethod
+    def _chunk_size(cls) -> int:
+        columns_amount = len(cls._table_class.__table__.columns)
+        return max(1, min(cls._bulk_chunk_size, MAX_BIND_PARAMS // columns_amount))
+
+    @classmethod
+    async def _insert_chunk(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+    ) -> list[int]:
+        table = cls._table_class.__table__
+        explicit_rows = [row for row in rows if "id" in row]
+        generated_rows = [row for row in rows if "id" not in row]
+
+        if explicit_rows:
+            await session.execute(insert(table).values(explicit_rows))
+
+        generated_ids: Iterator[int] = iter(())
+        if generated_rows:
+            # ids are handed out in VALUES order within a single INSERT,
+            # so sorting them restores the input order
+            generated_ids = iter(
+                sorted(
+                    (
+                        await session.execute(
+                            insert(table).values(generated_rows).returning(table.c.id),
+                        )
+                    ).scalars(),
+                ),
+            )
+
+        return [row["id"] if "id" in row else next(generated_ids) for row in rows]
+
+    @classmethod
+    def _select_columns(
+        cls,
+        fields: list[str] | None,
+        expand: list[str] | None = None,
+    ) -> list[Column[Any]]:
+        unknown_relations = [name for name in expand or () if name not in cls._relations]
+        if unknown_relations:
+            raise PesopolistException(f"Unknown relations: {', '.join(unknown_relations)}", 400)
+
+        columns = cls._table_class.__table__.columns
+        if not fields:
+            return list(columns)
+
+        # Expanded relations need their key column even if it wasn't requested
+        fields = [*fields, *(cls._relations[name].source_column for name in expand or ())]
+
+        unknown_fields = [field for field in fields if field not in columns]
+        if unknown_fields:
+            raise PesopolistException(f"Unknown fields: {', '.join(unknown_fields)}", 400)
+
+        return [columns[field] for field in dict.fromkeys(fields)]
+
+    @classmethod
+    def _serializer(cls, columns: Sequence[Column[Any]]) -> RowSerializer:
+        return row_serializer(tuple(column.name for column in columns))
+
+    @classmethod
+    def _render_in_db(cls, session: AsyncSession, render: str) -> bool:
+        return render == "db" and session.get_bind().dialect.name == "postgresql"
+
+    @classmethod
+    def _json_object(cls, columns: Sequence[Column[Any]]) -> ColumnElement[str]:
+        # Column names come from the table metadata, so they are safe to inline
+        return cast(
+            func.json_build_object(
+                *itertools.chain.from_iterable(
+                    (literal_column(f"'{column.name}'"), column) for column in columns
+                ),
+            ),
+            Text,
+        )
+
+    @classmethod
+    def _encode_cursor(cls, values: Sequence[Any]) -> str:
+        return base64.urlsafe_b64encode(orjson.dumps(list(values))).decode()
+
+    @classmethod
+    def _decode_cursor(cls, cursor: str) -> list[Any]:
+        try:
+            values = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError):
+            raise PesopolistException("Invalid cursor", 400) from None
+
+        if not isinstance(values, list) or len(values) != len(cls._order_columns):
+            raise PesopolistException("Invalid cursor", 400)
+
+        columns = cls._table_class.__table__.columns
+        try:
+            return [
+                datetime.fromisoformat(value)
+                if columns[column].type.python_type is datetime
+                else value
+                for column, value in zip(cls._order_columns, values, strict=True)
+            ]
+        except (TypeError, ValueError):
+            raise PesopolistException("Invalid cursor", 400) from None
+
+    @classmethod
+    @_conflicts_as_errors
+    async def bulk_load(
+        cls,
+        session: AsyncSession,
+        data: list[dict[str, Any]] | bytes,
+        from_other_object: bool = False,
+    ) -> dict[str, int]:
+        rows = validate_many(cls._model_class, data)
+        del data
+
+        await cls._load_rows(session, rows)
+        # COPY returns no ids, the whole table is invalidated
+        await cls._publish_rows(session, None)
+        await cls._publish_reports(session, await cls._loaded_reports(session, rows))
+
+        if not from_other_object:
+            await session.commit()
+
+        return {"loaded": len(rows)}
+
+    @classmethod
+    def _can_copy(cls) -> bool:
+        # asyncpg has only a text codec for money, binary COPY can't encode it
+        return not any(
+            isinstance(column.type, MONEY) for column in cls._table_class.__table__.columns
+        )
+
+    @classmethod
+    async def _load_rows(cls, session: AsyncSession, rows: Sequence[dict[str, Any]]) -> None:
+        connection = await session.connection()
+        if connection.dialect.name != "postgresql" or not cls._can_copy():
+            for chunk in _chunked(rows, cls._chunk_size()):
+                await cls._insert_chunk(session, chunk)
+            return
+
+        # The asyncpg adapter sends BEGIN only before its first statement. COPY goes around
+        # it, so without a statement first it would autocommit outside the transaction.
+        await connection.exec_driver_sql("SELECT 1")
+        table = cls._table_class.__table__
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        for with_id in (True, False):
+            group = [row for row in rows if ("id" in row) is with_id]
+            if not group:
+                continue
+
+            columns = [column.name for column in table.columns if with_id or column.name != "id"]
+            await driver_connection.copy_records_to_table(
+                table.name,
+                records=[tuple(row[column] for column in columns) for row in group],
+                columns=columns,
+                schema_name=table.schema,
+            )
+
+    @classmethod
+    async def import_ndjson(
+        cls,
+        session: AsyncSession,
+        body: AsyncIterator[bytes],
+        chunk_size: int | None = None,
+    ) -> dict[str, Any]:
+        chunk_size = chunk_size or cls._bulk_chunk_size
+        report: dict[str, Any] = {"inserted": 0, "failed": 0, "chunks": 0, "errors": []}
+        rows: list[dict[str, Any]] = []
+        line_numbers: list[int] = []
+
+        async for line_number, line in _iter_lines(body):
+            if not line.strip():
+                continue
+
+            try:
+                rows.append(_insert_values(cls._model_class.model_validate_json(line)))
+            except ValidationError as e:
+                _add_import_error(report, line_number, _validation_errors(e))
+                continue
+            line_numbers.append(line_number)
+
+            if len(rows) >= chunk_size:
+                await cls._import_chunk(session, report, rows, line_numbers)
+
+        if rows:
+            await cls._import_chunk(session, report, rows, line_numbers)
+
+        return report
+
+    @classmethod
+    async def _import_chunk(
+        cls,
+        session: AsyncSession,
+        report: dict[str, Any],
+        rows: list[dict[str, Any]],
+        line_numbers: list[int],
+    ) -> None:
+        """Commit one chunk of an import.
+
+        A chunk the database rejects is retried row by row, so only the lines that fail
+        on their own are reported and the other rows of the chunk are still imported.
+        """
+        error = await cls._commit_rows(session, rows)
+        if error is None:
+            report["inserted"] += len(rows)
+        elif len(rows) == 1:
+            _add_import_error(report, line_numbers[0], error)
+        else:
+            for row, line_number in zip(rows, line_numbers, strict=True):
+                row_error = await cls._commit_rows(session, [row])
+                if row_error is None:
+                    report["inserted"] += 1
+                else:
+                    _add_import_error(report, line_number, row_error)
+        report["chunks"] += 1
+        rows.clear()
+        line_numbers.clear()
+
+    @classmethod
+    async def _commit_rows(cls, session: AsyncSession, rows: list[dict[str, Any]]) -> str | None:
+        """Load and commit `rows` in one transaction, return the database error if any."""
+        try:
+            await cls._load_rows(session, rows)
+            await cls._publish_rows(session, None)
+            await cls._publish_reports(session, await cls._loaded_reports(session, rows))
+            await session.commit()
+        except (DBAPIError, PostgresError) as e:
+            await session.rollback()
+            return str(getattr(e, "orig", e))
+        return None
+
     @classmethod
     @abstractmethod
-    async def get(cls, session: AsyncSession, data: dict[str, Any] | None) -> list[dict[str, Any]]:
-        pass
+    async def get(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+    ) -> dict[str, Any]:
+        table = cls._table_class.__table__
+        columns = cls._select_columns(params.fields, params.expand)
+        if params.ids is not None:
+            return await cls._get_by_ids(session, data, params, columns)
+        if cls._from_snapshot and not data and params.render == "python":
+            return await cls._get_from_snapshot(session, params, columns)
+
+        render_in_db = not params.expand and cls._render_in_db(session, params.render)
+        selected = [cls._json_object(columns)] if render_in_db else columns
+
+        order_columns = [table.c[column] for column in cls._order_columns]
+        query = (
+            select(
+                *selected,
+                *(column.label(f"_cursor_{column.name}") for column in order_columns),
+            )
+            .where(*compile_filters(cls._table_class, data))
+            .order_by(*order_columns)
+            .limit(params.limit + 1)
+        )
+
+        if params.cursor:
+            query = query.where(tuple_(*order_columns) > tuple_(*cls._decode_cursor(params.cursor)))
+
+        rows = (await session.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > params.limit:
+            rows = rows[: params.limit]
+            next_cursor = cls._encode_cursor(rows[-1][len(selected) :])
+
+        if render_in_db:
+            # Rows are already JSON text, orjson embeds the fragment as is
+            items_json = b"[" + b",".join(row[0].encode() for row in rows) + b"]"
+            return {"items": orjson.Fragment(items_json), "next_cursor": next_cursor}
+
+        serialize = cls._serializer(columns)
+        items = [serialize(row) for row in rows]
+        if params.expand:
+            await expand_items(session, cls._relations, items, params.expand)
+
+        return {"items": items, "next_cursor": next_cursor}
+
+    @classmethod
+    async def _get_by_ids(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+        columns: list[Column[Any]],
+    ) -> dict[str, Any]:
+        table = cls._table_class.__table__
+        requested_ids = list(dict.fromkeys(params.ids or ()))
+        if cls._from_snapshot and not data and params.render == "python":
+            snapshot = await reference_data.get(session)
+            found = {
+                elem_id: {column.name: row[column.name] for column in columns}
+                for elem_id in requested_ids
+                if (row := snapshot.get(table.name, elem_id)) is not None
+            }
+        else:
+            query = select(*columns, table.c.id.label("_cursor_id")).where(
+                table.c.id.in_(requested_ids),
+                *compile_filters(cls._table_class, data),
+            )
+            serialize = cls._serializer(columns)
+            found = {row[-1]: serialize(row) for row in await session.execute(query)}
+        if params.expand:
+            await expand_items(session, cls._relations, list(found.values()), params.expand)
+
+        return {
+            "items": [found[elem_id] for elem_id in requested_ids if elem_id in found],
+            "missing_ids": [elem_id for elem_id in requested_ids if elem_id not in found],
+        }
 
     @classmethod
     async def get_one(
-        cls, session: AsyncSession, object_id: int, data: dict[str, Any] | None
+        cls,
+        session: AsyncSession,
+        object_id: int,
+        data: dict[str, Any] | None,
+        params: GetOneParamsModel | None = None,
     ) -> dict[str, Any]:
-        answer = (
-            await session.execute(select(cls._table_class).where(cls._table_class.id == object_id))
-        ).scalar()
+        params = params or GetOneParamsModel()
+        columns = cls._select_columns(params.fields, params.expand)
+        if cls._from_snapshot:
+            row = (await reference_data.get(session)).get(cls._table_class.__tablename__, object_id)
+            if row is None:
+                raise PesopolistException("Object not found", 404)
+            item = {column.name: row[column.name] for column in columns}
+        elif cls._cacheable:
+            row = await cls._get_cached_row(session, object_id)
+            item = {column.name: row[column.name] for column in columns}
+        else:
+            answer = (
+                await session.execute(select(*columns).where(cls._table_class.id == object_id))
+            ).first()
+
+            if not answer:
+                raise PesopolistException("Object not found", 404)
+
+            item = cls._serializer(columns)(answer)
+
+        if params.expand:
+            await expand_items(session, cls._relations, [item], params.expand)
+
+        return item
+
+    @classmethod
+    async def _get_from_snapshot(
+        cls,
+        session: AsyncSession,
+        params: GetParamsModel,
+        columns: list[Column[Any]],
+    ) -> dict[str, Any]:
+        # Snapshot tables are ordered by id only
+        rows = (await reference_data.get(session)).rows(cls._table_class.__tablename__)
+        after = cls._decode_cursor(params.cursor)[0] if params.cursor else None
+        page = [row for object_id, row in rows.items() if after is None or object_id > after][
+            : params.limit + 1
+        ]
+
+        next_cursor = None
+        if len(page) > params.limit:
+            page = page[: params.limit]
+            next_cursor = cls._encode_cursor([page[-1]["id"]])
+
+        items = [{column.name: row[column.name] for column in columns} for row in page]
+        if params.expand:
+            await expand_items(session, cls._relations, items, params.expand)
+
+        return {"items": items, "next_cursor": next_cursor}
+
+    @classmethod
+    async def _get_cached_row(cls, session: AsyncSession, object_id: int) -> dict[str, Any]:
+        table = cls._table_class.__table__
+        key = (table.name, object_id)
+        row = object_cache.get(key)
+        if row is None:
+            version = object_cache.version(table.name)
+            answer = (
+                await session.execute(select(*table.columns).where(table.c.id == object_id))
+            ).first()
+
+            if not answer:
+                raise PesopolistException("Object not found", 404)
+
+            row = table_serializers[table.name](answer)
+            object_cache.set(key, row, version)
+
+        return row
+
+    @classmethod
+    def export(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        fields: list[str] | None = None,
+        export_format: Literal["ndjson", "csv"] = "ndjson",
+        render: Literal["python", "db"] = "python",
+    ) -> AsyncIterator[bytes]:
+        # Query is built eagerly so that bad filters fail before the response starts
+        columns = cls._select_columns(fields)
+        render_in_db = export_format == "ndjson" and cls._render_in_db(session, render)
+        query = (
+            select(*([cls._json_object(columns)] if render_in_db else columns))
+            .where(*compile_filters(cls._table_class, data))
+            .order_by(*(cls._table_class.__table__.c[column] for column in cls._order_columns))
+            .execution_options(yield_per=cls._bulk_chunk_size)
+        )
+        if render_in_db:
+            return cls._stream_json_lines(session, query)
+        return cls._stream_rows(session, query, columns, export_format)
+
+    @classmethod
+    async def _stream_json_lines(
+        cls,
+        session: AsyncSession,
+        query: Select[Any],
+    ) -> AsyncIterator[bytes]:
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            yield "".join(row[0] + "\n" for row in rows).encode()
+
+    @classmethod
+    async def _stream_rows(
+        cls,
+        session: AsyncSession,
+        query: Select[Any],
+        columns: list[Column[Any]],
+        export_format: Literal["ndjson", "csv"],
+    ) -> AsyncIterator[bytes]:
+        serialize = cls._serializer(columns)
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(column.name for column in columns)
+
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            if export_format == "csv":
+                writer.writerows(rows)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            else:
+                yield b"".join(orjson.dumps(serialize(row)) + b"\n" for row in rows)
+
+    @classmethod
+    async def _affected_reports(
+        cls,
+        session: AsyncSession,
+        ids: Sequence[int],
+        columns: Sequence[str] | None = None,
+    ) -> list[AffectedReport]:
+        if cls._report_keys is None or not ids:
+            return []
 
-        if not answer:
-            raise PesopolistException("Object not found", 404)
+        affected: list[AffectedReport] = []
+        for chunk in _chunked(ids, cls._chunk_size()):
+            affected += await cls._report_keys(session, chunk, columns)
+        return affected
 
-        return answer.as_dict()
+    @classmethod
+    async def _publish_rows(cls, session: AsyncSession, ids: Iterable[int] | None) -> None:
+        # Only cached tables have anyone to notify, other writes skip the round trip
+        if cls._cacheable:
+            await invalidation.publish(session, cls._table_class.__tablename__, ids)
+
+    @classmethod
+    async def _loaded_reports(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+    ) -> list[AffectedReport]:
+        # Loaded rows are new, only links to existing lessons can change a salary
+        if cls._report_keys is None:
+            return []
+        lesson_ids = sorted({row["lesson_id"] for row in rows if "lesson_id" in row})
+        affected: list[AffectedReport] = []
+        for chunk in _chunked(lesson_ids, cls._chunk_size()):
+            affected += await lesson_report_keys(session, chunk, None)
+        return affected
+
+    @classmethod
+    async def _publish_reports(
+        cls,
+        session: AsyncSession,
+        affected: list[AffectedReport] | None,
+    ) -> None:
+        # None invalidates every report, used when the written ids are unknown
+        if cls._report_keys is None:
+            return
+        if affected is None:
+            await salary_ledger.refresh(session, None)
+            await invalidation.publish(session, SALARY_TOPIC, None)
+        else:
+            unique = {tuple(elem): elem for elem in affected}
+            await salary_ledger.refresh(session, list(unique.values()))
+            await invalidation.publish(session, SALARY_TOPIC, unique.values())
 
     @classmethod
     @abstractmethod
+    @_conflicts_as_errors
     async def update(
         cls,
         session: AsyncSession,
@@ -82,9 +826,28 @@ class AbstrackPesopolisObject(ABC):
         data: dict[str, Any],
         from_other_object: bool = False,
     ) -> dict[str, Any]:
-        await session.execute(
-            _update(cls._table_class).values(**data).where(cls._table_class.id == object_id)
-        )
+        try:
+            values = (
+                partial_model(cls._model_class).model_validate(data).model_dump(exclude_unset=True)
+            )
+        except ValidationError as e:
+            raise _validation_error(e) from None
+        del data
+        # The object is addressed by the path, an id in the body is ignored
+        values.pop("id", None)
+
+        if values:
+            table = cls._table_class.__table__
+            columns = tuple(sorted(values))
+            # Reports are affected both where the row was and where it is now
+            affected = await cls._affected_reports(session, [object_id], columns)
+            await session.execute(
+                update_statements.get(table, columns),
+                update_params(object_id, values),
+            )
+            await cls._publish_rows(session, [object_id])
+            affected += await cls._affected_reports(session, [object_id], columns)
+            await cls._publish_reports(session, affected)
 
         if not from_other_object:
             await session.commit()
@@ -93,29 +856,61 @@ class AbstrackPesopolisObject(ABC):
 
     @classmethod
     @abstractmethod
+    @_conflicts_as_errors
     async def update_many(
         cls,
         session: AsyncSession,
         data: list[dict[str, Any]],
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
-        updated_ids = []
-        for elem in data:
-            updated_ids.append(
-                (await cls.update(session, elem.pop("id"), elem, True))["updated_id"]
+        rows = validate_many(_partial_model_with_id(cls._model_class), data, exclude_unset=True)
+        del data
+
+        table = cls._table_class.__table__
+        # Rows of the same id are merged in input order, so the last value of a column wins
+        merged: dict[int, dict[str, Any]] = {}
+        for row in rows:
+            merged.setdefault(row.pop("id"), {}).update(row)
+        requested_ids = list(merged)
+
+        existing_ids: set[int] = set()
+        for chunk in _chunked(requested_ids, cls._chunk_size()):
+            existing_ids.update(
+                (await session.execute(select(table.c.id).where(table.c.id.in_(chunk)))).scalars(),
             )
 
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for object_id, row in merged.items():
+            if object_id not in existing_ids or not row:
+                continue
+            groups.setdefault(tuple(sorted(row)), []).append(update_params(object_id, row))
+
+        affected: list[AffectedReport] = []
+        for columns, params in groups.items():
+            ids = [param["_id"] for param in params]
+            affected += await cls._affected_reports(session, ids, columns)
+            await session.execute(update_statements.get(table, columns), params)
+            affected += await cls._affected_reports(session, ids, columns)
+        await cls._publish_rows(session, existing_ids)
+        await cls._publish_reports(session, affected)
+
         if not from_other_object:
             await session.commit()
 
-        return {"updated_ids": updated_ids}
+        return {
+            "updated_ids": [elem_id for elem_id in requested_ids if elem_id in existing_ids],
+            "missing_ids": [elem_id for elem_id in requested_ids if elem_id not in existing_ids],
+        }
 
     @classmethod
     @abstractmethod
     async def delete(
         cls, session: AsyncSession, object_id: int, from_other_object: bool = False
     ) -> dict[str, Any]:
+        affected = await cls._affected_reports(session, [object_id])
         await session.execute(delete(cls._table_class).where(cls._table_class.id == object_id))
+        await cls._publish_rows(session, [object_id])
+        await cls._publish_reports(session, affected)
 
         if not from_other_object:
             await session.commit()
@@ -130,11 +925,26 @@ class AbstrackPesopolisObject(ABC):
         object_ids: list[int],
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
-        updated_ids = []
-        for elem_id in object_ids:
-            updated_ids.append((await cls.delete(session, elem_id, True))["deleted_id"])
+        table = cls._table_class.__table__
+        requested_ids = list(dict.fromkeys(object_ids))
+
+        affected = await cls._affected_reports(session, requested_ids)
+        deleted_ids: set[int] = set()
+        for chunk in _chunked(requested_ids, cls._chunk_size()):
+            deleted_ids.update(
+                (
+                    await session.execute(
+                        delete(table).where(table.c.id.in_(chunk)).returning(table.c.id),
+                    )
+                ).scalars(),
+            )
+        await cls._publish_rows(session, deleted_ids)
+        await cls._publish_reports(session, affected)
 
         if not from_other_object:
             await session.commit()
 
-        return {"deleted_ids": updated_ids}
+        return {
+            "deleted_ids": [elem_id for elem_id in requested_ids if elem_id in deleted_ids],
+            "missing_ids": [elem_id for elem_id in requested_ids if elem_id not in deleted_ids],
+        }
@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db import Administrator as AdministratorTable
 
-from .abstract_object import AbstrackPesopolisObject
+from .abstract_object import AbstrackPesopolisObject, GetOneParamsModel, GetParamsModel
 
 
 class AdministratorModel(BaseModel):
@@ -32,20 +32,29 @@ class Administrator(AbstrackPesopolisObject):
     async def create_many(
         cls,
         session: AsyncSession,
-        data: list[dict[str, Any]],
+        data: list[dict[str, Any]] | bytes,
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
         return await super().create_many(session, data, from_other_object)
 
     @classmethod
-    async def get(cls, session: AsyncSession, data: dict[str, Any] | None) -> list[dict[str, Any]]:
-        return await super().get(session, data)
+    async def get(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+    ) -> dict[str, Any]:
+        return await super().get(session, data, params)
 
     @classmethod
     async def get_one(
-        cls, session: AsyncSession, object_id: int, data: dict[str, Any] | None
+        cls,
+        session: AsyncSession,
+        object_id: int,
+        data: dict[str, Any] | None,
+        params: GetOneParamsModel | None = None,
     ) -> dict[str, Any]:
-        return await super().get_one(session, object_id, data)
+        return await super().get_one(session, object_id, data, params)
 
     @classmethod
     async def update(
@@ -0,0 +1,94 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from src.config import OBJECT_CACHE_SIZE, OBJECT_CACHE_TTL
+
+from . import invalidation
+
+CacheKey = tuple[str, int]
+
+
+class ObjectCache:
+    """Bounded LRU of rows keyed by (table, id), entries expire after `ttl` seconds.
+
+    Every eviction bumps the version of the table, `set` takes the version read before the
+    row was loaded and skips a row that an invalidation may have made outdated meanwhile.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[CacheKey, tuple[float, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._epoch = 0
+        self._table_versions: dict[str, int] = {}
+
+    def get(self, key: CacheKey) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def version(self, table_name: str) -> tuple[int, int]:
+        return self._epoch, self._table_versions.get(table_name, 0)
+
+    def set(self, key: CacheKey, value: dict[str, Any], version: tuple[int, int]) -> None:
+        if self.maxsize <= 0 or version != self.version(key[0]):
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def evict(self, keys: Iterable[CacheKey]) -> None:
+        for key in keys:
+            self._bump(key[0])
+            self._entries.pop(key, None)
+
+    def evict_table(self, table_name: str) -> None:
+        self._bump(table_name)
+        for key in [key for key in self._entries if key[0] == table_name]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._table_versions.clear()
+        self._entries.clear()
+
+    def _bump(self, table_name: str) -> None:
+        self._table_versions[table_name] = self._table_versions.get(table_name, 0) + 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+object_cache = ObjectCache(OBJECT_CACHE_SIZE, OBJECT_CACHE_TTL)
+
+
+def _on_invalidate(table_name: str, ids: list[int] | None) -> None:
+    if ids is None:
+        object_cache.evict_table(table_name)
+    else:
+        object_cache.evict((table_name, object_id) for object_id in ids)
+
+
+# Tables of objects with `_cacheable`, filled as the object classes are defined
+cached_tables: set[str] = set()
+invalidation.subscribe(cached_tables, _on_invalidate, object_cache.clear)
@@ -1,11 +1,14 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, ClassVar
 
 from pydantic import BaseModel, StringConstraints
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db import Cource as CourseTable
+from src.db import Dog as DogTable
+from src.db.models import CourseToDog as CourseToDogTable
 
-from .abstract_object import AbstrackPesopolisObject
+from .abstract_object import AbstrackPesopolisObject, GetOneParamsModel, GetParamsModel
+from .relations import ManyToMany, Relation
 
 
 class CourseModel(BaseModel):
@@ -18,6 +21,11 @@ class CourseModel(BaseModel):
 class Course(AbstrackPesopolisObject):
     _table_class = CourseTable
     _model_class = CourseModel
+    _cacheable = True
+    _from_snapshot = True
+    _relations: ClassVar[dict[str, Relation]] = {
+        "dogs": ManyToMany(CourseToDogTable, "course_id", "dog_id", DogTable),
+    }
 
     @classmethod
     async def create(
@@ -32,20 +40,29 @@ class Course(AbstrackPesopolisObject):
     async def create_many(
         cls,
         session: AsyncSession,
-        data: list[dict[str, Any]],
+        data: list[dict[str, Any]] | bytes,
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
         return await super().create_many(session, data, from_other_object)
 
     @classmethod
-    async def get(cls, session: AsyncSession, data: dict[str, Any] | None) -> list[dict[str, Any]]:
-        return await super().get(session, data)
+    async def get(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+    ) -> dict[str, Any]:
+        return await super().get(session, data, params)
 
     @classmethod
     async def get_one(
-        cls, session: AsyncSession, object_id: int, data: dict[str, Any] | None
+        cls,
+        session: AsyncSession,
+        object_id: int,
+        data: dict[str, Any] | None,
+        params: GetOneParamsModel | None = None,
     ) -> dict[str, Any]:
-        return await super().get_one(session, object_id, data)
+        return await super().get_one(session, object_id, data, params)
 
     @classmethod
     async def update(
@@ -1,11 +1,18 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, ClassVar
 
 from pydantic import BaseModel, StringConstraints
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db import Cource as CourseTable
+from src.db import Customer as CustomerTable
 from src.db import Dog as DogTable
+from src.db import Lesson as LessonTable
+from src.db import LessonDog as LessonDogTable
+from src.db.models import CourseToDog as CourseToDogTable
 
-from .abstract_object import AbstrackPesopolisObject
+from .abstract_object import AbstrackPesopolisObject, GetOneParamsModel, GetParamsModel
+from .relations import ManyToMany, ManyToOne, Relation
+from .report_cache import dog_report_keys
 
 
 class DogModel(BaseModel):
@@ -20,6 +27,12 @@ class DogModel(BaseModel):
 class Dog(AbstrackPesopolisObject):
     _table_class = DogTable
     _model_class = DogModel
+    _report_keys = staticmethod(dog_report_keys)
+    _relations: ClassVar[dict[str, Relation]] = {
+        "owner": ManyToOne("owner", CustomerTable),
+        "courses": ManyToMany(CourseToDogTable, "dog_id", "course_id", CourseTable),
+        "lessons": ManyToMany(LessonDogTable, "dog_id", "lesson_id", LessonTable),
+    }
 
     @classmethod
     async def create(
@@ -34,20 +47,29 @@ class Dog(AbstrackPesopolisObject):
     async def create_many(
         cls,
         session: AsyncSession,
-        data: list[dict[str, Any]],
+        data: list[dict[str, Any]] | bytes,
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
         return await super().create_many(session, data, from_other_object)
 
     @classmethod
-    async def get(cls, session: AsyncSession, data: dict[str, Any] | None) -> list[dict[str, Any]]:
-        return await super().get(session, data)
+    async def get(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+    ) -> dict[str, Any]:
+        return await super().get(session, data, params)
 
     @classmethod
     async def get_one(
-        cls, session: AsyncSession, object_id: int, data: dict[str, Any] | None
+        cls,
+        session: AsyncSession,
+        object_id: int,
+        data: dict[str, Any] | None,
+        params: GetOneParamsModel | None = None,
     ) -> dict[str, Any]:
-        return await super().get_one(session, object_id, data)
+        return await super().get_one(session, object_id, data, params)
 
     @classmethod
     async def update(
@@ -0,0 +1,118 @@
+import functools
+import operator
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Column, ColumnElement, String, and_
+
+from src.db.models import AbstractTable
+from src.exceptions import PesopolistException
+
+RANGE_OPERATORS = {
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+BETWEEN_BOUNDS = 2
+
+
+@functools.cache
+def _type_adapter(python_type: type) -> TypeAdapter[Any]:
+    return TypeAdapter(python_type)
+
+
+def _coerce(column: Column[Any], value: Any) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    try:
+        return _type_adapter(python_type).validate_python(value)
+    except ValidationError:
+        raise PesopolistException(f"Invalid value for {column.name}: {value!r}", 400) from None
+
+
+def _eq(column: Column[Any], value: object) -> ColumnElement[bool]:
+    return column == _coerce(column, value)
+
+
+def _in(column: Column[Any], value: object) -> ColumnElement[bool]:
+    if not isinstance(value, list):
+        raise PesopolistException(f"Operator in for {column.name} expects a list", 400)
+    return column.in_([_coerce(column, elem) for elem in value])
+
+
+def _range(compare: Callable[[Any, Any], Any]) -> Callable[[Column[Any], object], Any]:
+    return lambda column, value: compare(column, _coerce(column, value))
+
+
+def _between(column: Column[Any], value: object) -> ColumnElement[bool]:
+    if not isinstance(value, list) or len(value) != BETWEEN_BOUNDS:
+        raise PesopolistException(f"Operator between for {column.name} expects [start, end]", 400)
+    return column.between(_coerce(column, value[0]), _coerce(column, value[1]))
+
+
+def _is_null(column: Column[Any], value: object) -> ColumnElement[bool]:
+    return column.is_(None) if value else column.is_not(None)
+
+
+def _prefix(column: Column[Any], value: object) -> ColumnElement[bool]:
+    if not isinstance(column.type, String) or not isinstance(value, str):
+        raise PesopolistException(f"Operator prefix is not allowed for {column.name}", 400)
+    return column.startswith(value, autoescape=True)
+
+
+OPERATORS: dict[str, Callable[[Column[Any], object], ColumnElement[bool]]] = {
+    "eq": _eq,
+    "in": _in,
+    **{name: _range(compare) for name, compare in RANGE_OPERATORS.items()},
+    "between": _between,
+    "is_null": _is_null,
+    "prefix": _prefix,
+}
+
+
+def _compile_condition(column: Column[Any], condition: Any) -> ColumnElement[bool]:
+    if not isinstance(condition, dict):
+        if condition is None:
+            return column.is_(None)
+        return _eq(column, condition)
+
+    if not condition:
+        raise PesopolistException(f"Empty filter for {column.name}", 400)
+
+    clauses = []
+    for operator_name, value in condition.items():
+        if operator_name not in OPERATORS:
+            raise PesopolistException(f"Unknown filter operator: {operator_name}", 400)
+        clauses.append(OPERATORS[operator_name](column, value))
+
+    return and_(*clauses)
+
+
+def compile_filters(
+    table_class: type[AbstractTable],
+    data: dict[str, Any] | None,
+) -> list[ColumnElement[bool]]:
+    """Compile `{"column": value | {"operator": value}}` into WHERE clauses.
+
+    Supported operators: eq, in, gt, gte, lt, lte, between, is_null, prefix.
+    A plain value means eq, a plain null means is_null.
+    """
+    if not data:
+        return []
+
+    if not isinstance(data, dict):
+        raise PesopolistException("Filter must be a JSON object", 400)
+
+    columns = table_class.__table__.columns
+    clauses = []
+    for column_name, condition in data.items():
+        if column_name not in columns:
+            raise PesopolistException(f"Unknown filter field: {column_name}", 400)
+        clauses.append(_compile_condition(columns[column_name], condition))
+
+    return clauses
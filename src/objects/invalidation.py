@@ -0,0 +1,192 @@
+"""Cache invalidation shared by all workers.
+
+Writes in the object layer call `publish`. Local caches are evicted right away and once
+more when the transaction ends. On PostgreSQL the same event is sent with `pg_notify`
+inside the writing transaction, so PostgreSQL delivers it to every worker's listener only
+if the transaction commits. Other databases use an in-memory channel with the same
+semantics, which lets tests run several "workers" in one process.
+"""
+
+import asyncio
+from collections.abc import Callable, Collection, Iterable
+from typing import Any
+
+import asyncpg
+import orjson
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import CACHE_INVALIDATION_CHANNEL
+from src.log import logger
+
+InvalidateCallback = Callable[[str, list[Any] | None], None]
+ResetCallback = Callable[[], None]
+
+# NOTIFY payloads are limited to 8000 bytes, ids are sent in chunks that fit
+NOTIFY_IDS_PER_MESSAGE = 250
+RECONNECT_DELAY = 1.0
+
+_PENDING_LOCAL = "pending_invalidations"
+_PENDING_MEMORY = "pending_memory_notifications"
+
+_subscribers: list[tuple[Collection[str], InvalidateCallback, ResetCallback]] = []
+_memory_listeners: list["MemoryListener"] = []
+
+
+def subscribe(
+    topics: Collection[str],
+    on_invalidate: InvalidateCallback,
+    on_reset: ResetCallback,
+) -> None:
+    """Register a cache of this worker for events of `topics`.
+
+    Topics are table names with row ids, other topics carry their own JSON keys, see
+    `report_cache`. `on_invalidate(topic, ids)` evicts entries, `ids=None` means all of
+    the topic. `on_reset()` drops everything and is called when events may have been missed.
+    """
+    _subscribers.append((topics, on_invalidate, on_reset))
+
+
+def dispatch(topic: str, ids: list[Any] | None) -> None:
+    for topics, on_invalidate, _ in _subscribers:
+        if topic in topics:
+            on_invalidate(topic, ids)
+
+
+def reset() -> None:
+    for _, _, on_reset in _subscribers:
+        on_reset()
+
+
+def is_subscribed(topic: str) -> bool:
+    return any(topic in topics for topics, _, _ in _subscribers)
+
+
+async def publish(session: AsyncSession, table_name: str, ids: Iterable[Any] | None) -> None:
+    # Nobody caches the topic, there is nothing to evict
+    if not is_subscribed(table_name):
+        return
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return
+
+    dispatch(table_name, ids)
+    info = session.sync_session.info
+    info.setdefault(_PENDING_LOCAL, []).append((table_name, ids))
+
+    if session.get_bind().dialect.name != "postgresql":
+        # Pending events belong to the transaction, make sure one has begun
+        await session.connection()
+        info.setdefault(_PENDING_MEMORY, []).append((table_name, ids))
+        return
+
+    chunks = (
+        [None]
+        if ids is None
+        else [
+            ids[start : start + NOTIFY_IDS_PER_MESSAGE]
+            for start in range(0, len(ids), NOTIFY_IDS_PER_MESSAGE)
+        ]
+    )
+    for chunk in chunks:
+        payload = {"table": table_name, "ids": chunk}
+        await session.execute(
+            select(func.pg_notify(CACHE_INVALIDATION_CHANNEL, orjson.dumps(payload).decode())),
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver_committed(session: Session) -> None:
+    # Values read by other requests while the write was in flight are evicted again
+    for table_name, ids in session.info.pop(_PENDING_LOCAL, []):
+        dispatch(table_name, ids)
+    for table_name, ids in session.info.pop(_PENDING_MEMORY, []):
+        for listener in _memory_listeners:
+            listener.callback(table_name, ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back(session: Session) -> None:
+    for table_name, ids in session.info.pop(_PENDING_LOCAL, []):
+        dispatch(table_name, ids)
+    session.info.pop(_PENDING_MEMORY, None)
+
+
+class PostgresListener:
+    """One dedicated asyncpg connection per worker doing LISTEN on the channel."""
+
+    def __init__(
+        self,
+        dsn: str,
+        callback: InvalidateCallback = dispatch,
+        on_reset: ResetCallback = reset,
+    ) -> None:
+        self.dsn = dsn
+        self.callback = callback
+        self.on_reset = on_reset
+        self._connection: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._stopped = False
+
+    async def start(self) -> None:
+        self._stopped = False
+        self._connection = await asyncpg.connect(self.dsn)
+        self._connection.add_termination_listener(self._on_termination)
+        await self._connection.add_listener(CACHE_INVALIDATION_CHANNEL, self._on_notification)
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    def _on_notification(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        message = orjson.loads(payload)
+        self.callback(message["table"], message["ids"])
+
+    def _on_termination(self, _connection: Any) -> None:
+        if not self._stopped:
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._stopped:
+            await asyncio.sleep(RECONNECT_DELAY)
+            try:
+                await self.start()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning(f"Cache invalidation listener reconnect failed: {e}")
+                continue
+
+            # Notifications sent while disconnected are lost
+            self.on_reset()
+            return
+
+
+class MemoryListener:
+    """In-process stand-in for `PostgresListener` used with other databases."""
+
+    def __init__(
+        self,
+        callback: InvalidateCallback = dispatch,
+        on_reset: ResetCallback = reset,
+    ) -> None:
+        self.callback = callback
+        self.on_reset = on_reset
+
+    async def start(self) -> None:
+        _memory_listeners.append(self)
+
+    async def stop(self) -> None:
+        if self in _memory_listeners:
+            _memory_listeners.remove(self)
+
+
+def create_listener(url: URL) -> PostgresListener | MemoryListener:
+    if url.get_backend_name() != "postgresql":
+        return MemoryListener()
+    return PostgresListener(url.set(drivername="postgresql").render_as_string(hide_password=False))
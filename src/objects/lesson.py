@@ -1,12 +1,25 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, ClassVar
 
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db import Dog as DogTable
 from src.db import Lesson as LessonTable
+from src.db import LessonDog as LessonDogTable
+from src.db import LessonStaff as LessonStaffTable
+from src.db import Staff as StaffTable
 
-from .abstract_object import AbstrackPesopolisObject
+from .abstract_object import (
+    AbstrackPesopolisObject,
+    GetOneParamsModel,
+    GetParamsModel,
+    validate_many,
+)
+from .lesson_dog import LessonDog
+from .lesson_staff import LessonStaff
+from .relations import ManyToMany, Relation
+from .report_cache import lesson_report_keys
 
 
 class LessonModel(BaseModel):
@@ -15,9 +28,20 @@ class LessonModel(BaseModel):
     date: datetime
 
 
+class LessonWithParticipantsModel(LessonModel):
+    dog_ids: list[int] = []
+    staff_ids: list[int] = []
+
+
 class Lesson(AbstrackPesopolisObject):
     _table_class = LessonTable
     _model_class = LessonModel
+    _report_keys = staticmethod(lesson_report_keys)
+    _order_columns = ("date", "id")
+    _relations: ClassVar[dict[str, Relation]] = {
+        "dogs": ManyToMany(LessonDogTable, "lesson_id", "dog_id", DogTable),
+        "staff": ManyToMany(LessonStaffTable, "lesson_id", "staff_id", StaffTable),
+    }
 
     @classmethod
     async def create(
@@ -32,20 +56,29 @@ class Lesson(AbstrackPesopolisObject):
     async def create_many(
         cls,
         session: AsyncSession,
-        data: list[dict[str, Any]],
+        data: list[dict[str, Any]] | bytes,
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
         return await super().create_many(session, data, from_other_object)
 
     @classmethod
-    async def get(cls, session: AsyncSession, data: dict[str, Any] | None) -> list[dict[str, Any]]:
-        return await super().get(session, data)
+    async def get(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+    ) -> dict[str, Any]:
+        return await super().get(session, data, params)
 
     @classmethod
     async def get_one(
-        cls, session: AsyncSession, object_id: int, data: dict[str, Any] | None
+        cls,
+        session: AsyncSession,
+        object_id: int,
+        data: dict[str, Any] | None,
+        params: GetOneParamsModel | None = None,
     ) -> dict[str, Any]:
-        return await super().get_one(session, object_id, data)
+        return await super().get_one(session, object_id, data, params)
 
     @classmethod
     async def update(
@@ -55,8 +88,6 @@ class Lesson(AbstrackPesopolisObject):
         data: dict[str, Any],
         from_other_object: bool = False,
     ) -> dict[str, Any]:
-        if "date" in data:
-            data["date"] = datetime.fromisoformat(data["date"])
         return await super().update(session, object_id, data, from_other_object)
 
     @classmethod
@@ -82,3 +113,52 @@ class Lesson(AbstrackPesopolisObject):
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
         return await super().delete_many(session, object_ids, from_other_object)
+
+    @classmethod
+    async def create_with_participants(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any],
+        from_other_object: bool = False,
+    ) -> dict[str, int]:
+        res = await cls.create_many_with_participants(session, [data], from_other_object)
+        return {"created_id": res["created_ids"][0]}
+
+    @classmethod
+    async def create_many_with_participants(
+        cls,
+        session: AsyncSession,
+        data: list[dict[str, Any]] | bytes,
+        from_other_object: bool = False,
+    ) -> dict[str, list[int]]:
+        lessons = validate_many(LessonWithParticipantsModel, data)
+        del data
+        participants = [(lesson.pop("dog_ids"), lesson.pop("staff_ids")) for lesson in lessons]
+
+        # One multi-row INSERT for the lessons and one bulk load per link table,
+        # all in the same transaction
+        created_ids = (await cls.create_many(session, lessons, True))["created_ids"]
+
+        await LessonDog.bulk_load(
+            session,
+            [
+                {"lesson_id": lesson_id, "dog_id": dog_id}
+                for lesson_id, (dog_ids, _) in zip(created_ids, participants, strict=True)
+                for dog_id in dict.fromkeys(dog_ids)
+            ],
+            True,
+        )
+        await LessonStaff.bulk_load(
+            session,
+            [
+                {"lesson_id": lesson_id, "staff_id": staff_id}
+                for lesson_id, (_, staff_ids) in zip(created_ids, participants, strict=True)
+                for staff_id in dict.fromkeys(staff_ids)
+            ],
+            True,
+        )
+
+        if not from_other_object:
+            await session.commit()
+
+        return {"created_ids": created_ids}
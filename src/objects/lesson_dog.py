@@ -1,12 +1,15 @@
-from datetime import datetime
-from typing import Any
+from typing import Any, ClassVar
 
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db import Dog as DogTable
+from src.db import Lesson as LessonTable
 from src.db import LessonDog as LessonDogTable
 
-from .abstract_object import AbstrackPesopolisObject
+from .abstract_object import AbstrackPesopolisObject, GetOneParamsModel, GetParamsModel
+from .relations import ManyToOne, Relation
+from .report_cache import lesson_dog_report_keys
 
 
 class LessonDogModel(BaseModel):
@@ -18,6 +21,11 @@ class LessonDogModel(BaseModel):
 class LessonDog(AbstrackPesopolisObject):
     _table_class = LessonDogTable
     _model_class = LessonDogModel
+    _report_keys = staticmethod(lesson_dog_report_keys)
+    _relations: ClassVar[dict[str, Relation]] = {
+        "dog": ManyToOne("dog_id", DogTable),
+        "lesson": ManyToOne("lesson_id", LessonTable),
+    }
 
     @classmethod
     async def create(
@@ -32,20 +40,29 @@ class LessonDog(AbstrackPesopolisObject):
     async def create_many(
         cls,
         session: AsyncSession,
-        data: list[dict[str, Any]],
+        data: list[dict[str, Any]] | bytes,
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
         return await super().create_many(session, data, from_other_object)
 
     @classmethod
-    async def get(cls, session: AsyncSession, data: dict[str, Any] | None) -> list[dict[str, Any]]:
-        return await super().get(session, data)
+    async def get(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+    ) -> dict[str, Any]:
+        return await super().get(session, data, params)
 
     @classmethod
     async def get_one(
-        cls, session: AsyncSession, object_id: int, data: dict[str, Any] | None
+        cls,
+        session: AsyncSession,
+        object_id: int,
+        data: dict[str, Any] | None,
+        params: GetOneParamsModel | None = None,
     ) -> dict[str, Any]:
-        return await super().get_one(session, object_id, data)
+        return await super().get_one(session, object_id, data, params)
 
     @classmethod
     async def update(
@@ -55,8 +72,6 @@ class LessonDog(AbstrackPesopolisObject):
         data: dict[str, Any],
         from_other_object: bool = False,
     ) -> dict[str, Any]:
-        if "date" in data:
-            data["date"] = datetime.fromisoformat(data["date"])
         return await super().update(session, object_id, data, from_other_object)
 
     @classmethod
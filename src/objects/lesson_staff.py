@@ -1,11 +1,15 @@
-from typing import Any
+from typing import Any, ClassVar
 
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db import Lesson as LessonTable
 from src.db import LessonStaff as LessonStaffTable
+from src.db import Staff as StaffTable
 
-from .abstract_object import AbstrackPesopolisObject
+from .abstract_object import AbstrackPesopolisObject, GetOneParamsModel, GetParamsModel
+from .relations import ManyToOne, Relation
+from .report_cache import lesson_staff_report_keys
 
 
 class LessonStaffModel(BaseModel):
@@ -17,6 +21,11 @@ class LessonStaffModel(BaseModel):
 class LessonStaff(AbstrackPesopolisObject):
     _table_class = LessonStaffTable
     _model_class = LessonStaffModel
+    _report_keys = staticmethod(lesson_staff_report_keys)
+    _relations: ClassVar[dict[str, Relation]] = {
+        "staff": ManyToOne("staff_id", StaffTable),
+        "lesson": ManyToOne("lesson_id", LessonTable),
+    }
 
     @classmethod
     async def create(
@@ -31,20 +40,29 @@ class LessonStaff(AbstrackPesopolisObject):
     async def create_many(
         cls,
         session: AsyncSession,
-        data: list[dict[str, Any]],
+        data: list[dict[str, Any]] | bytes,
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
         return await super().create_many(session, data, from_other_object)
 
     @classmethod
-    async def get(cls, session: AsyncSession, data: dict[str, Any] | None) -> list[dict[str, Any]]:
-        return await super().get(session, data)
+    async def get(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+    ) -> dict[str, Any]:
+        return await super().get(session, data, params)
 
     @classmethod
     async def get_one(
-        cls, session: AsyncSession, object_id: int, data: dict[str, Any] | None
+        cls,
+        session: AsyncSession,
+        object_id: int,
+        data: dict[str, Any] | None,
+        params: GetOneParamsModel | None = None,
     ) -> dict[str, Any]:
-        return await super().get_one(session, object_id, data)
+        return await super().get_one(session, object_id, data, params)
 
     @classmethod
     async def update(
@@ -0,0 +1,79 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db import Cource as CourseTable
+from src.db import StaffStatus as StaffStatusTable
+from src.db import table_serializers
+
+from . import invalidation
+
+REFERENCE_TABLES: tuple[Table, ...] = (StaffStatusTable.__table__, CourseTable.__table__)
+
+Row = Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """Read-only rows of the reference tables, each table ordered by id."""
+
+    tables: Mapping[str, Mapping[int, Row]]
+
+    def rows(self, table_name: str) -> Mapping[int, Row]:
+        return self.tables[table_name]
+
+    def get(self, table_name: str, object_id: int) -> Row | None:
+        return self.tables[table_name].get(object_id)
+
+
+class ReferenceData:
+    """Holds the current snapshot, a changed table drops it and the next read reloads.
+
+    A snapshot is never modified, readers keep the one they got while a new one is
+    swapped in by a single assignment.
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: ReferenceSnapshot | None = None
+        self._version = 0
+
+    async def get(self, session: AsyncSession) -> ReferenceSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            version = self._version
+            snapshot = await self.load(session)
+            # A write committed while loading makes this snapshot outdated
+            if version == self._version:
+                self._snapshot = snapshot
+        return snapshot
+
+    async def load(self, session: AsyncSession) -> ReferenceSnapshot:
+        tables = {}
+        for table in REFERENCE_TABLES:
+            serialize = table_serializers[table.name]
+            # Rows go through the table serializer like every other read path, so values
+            # (money included) have the same representation in every response
+            rows = await session.execute(select(table).order_by(table.c.id))
+            tables[table.name] = MappingProxyType(
+                {row.id: MappingProxyType(serialize(row)) for row in rows},
+            )
+        return ReferenceSnapshot(MappingProxyType(tables))
+
+    def invalidate(self, _table_name: str, _ids: list[int] | None) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._version += 1
+        self._snapshot = None
+
+
+reference_data = ReferenceData()
+invalidation.subscribe(
+    [table.name for table in REFERENCE_TABLES],
+    reference_data.invalidate,
+    reference_data.reset,
+)
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db import table_serializers
+from src.db.models import AbstractTable
+
+
+@dataclass(frozen=True)
+class ManyToOne:
+    """Foreign key `column` of the object pointing to `target`."""
+
+    column: str
+    target: type[AbstractTable]
+
+    @property
+    def source_column(self) -> str:
+        return self.column
+
+    async def load(self, session: AsyncSession, keys: list[Any]) -> dict[Any, dict[str, Any]]:
+        target = self.target.__table__
+        serialize = table_serializers[target.name]
+        rows = await session.execute(select(*target.columns).where(target.c.id.in_(keys)))
+        return {row.id: serialize(row) for row in rows}
+
+
+@dataclass(frozen=True)
+class OneToMany:
+    """Rows of `target` whose `remote_key` points to the object."""
+
+    target: type[AbstractTable]
+    remote_key: str
+
+    source_column = "id"
+
+    async def load(self, session: AsyncSession, keys: list[Any]) -> dict[Any, list[dict[str, Any]]]:
+        target = self.target.__table__
+        serialize = table_serializers[target.name]
+        rows = await session.execute(
+            select(*target.columns)
+            .where(target.c[self.remote_key].in_(keys))
+            .order_by(target.c.id),
+        )
+
+        result: dict[Any, list[dict[str, Any]]] = {}
+        for row in rows:
+            elem = serialize(row)
+            result.setdefault(elem[self.remote_key], []).append(elem)
+        return result
+
+
+@dataclass(frozen=True)
+class ManyToMany:
+    """Rows of `target` linked to the object through the `link` table."""
+
+    link: type[AbstractTable]
+    local_key: str
+    remote_key: str
+    target: type[AbstractTable]
+
+    source_column = "id"
+
+    async def load(self, session: AsyncSession, keys: list[Any]) -> dict[Any, list[dict[str, Any]]]:
+        link = self.link.__table__
+        target = self.target.__table__
+        serialize = table_serializers[target.name]
+        rows = await session.execute(
+            select(*target.columns, link.c[self.local_key].label("_parent_id"))
+            .join(target, target.c.id == link.c[self.remote_key])
+            .where(link.c[self.local_key].in_(keys))
+            .order_by(link.c.id),
+        )
+
+        result: dict[Any, list[dict[str, Any]]] = {}
+        for row in rows:
+            result.setdefault(row[-1], []).append(serialize(row))
+        return result
+
+
+Relation = ManyToOne | OneToMany | ManyToMany
+
+
+async def expand_items(
+    session: AsyncSession,
+    relations: dict[str, Relation],
+    items: list[dict[str, Any]],
+    expand: list[str],
+) -> None:
+    """Nest related objects into `items` with one IN query per relation."""
+    names = list(dict.fromkeys(expand))
+    # Source values are read up front: a many-to-one relation may replace its own column
+    sources = {name: [item[relations[name].source_column] for item in items] for name in names}
+
+    for name in names:
+        relation = relations[name]
+        keys = list(set(sources[name]) - {None})
+        loaded: dict[Any, Any] = await relation.load(session, keys) if keys else {}
+
+        for item, key in zip(items, sources[name], strict=True):
+            item[name] = loaded.get(key, None if isinstance(relation, ManyToOne) else [])
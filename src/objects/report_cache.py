@@ -0,0 +1,205 @@
+"""Cache of salary reports and the queries that find which reports a write affects.
+
+Reports are keyed by (staff_id, start_date, end_date). Writes publish the affected
+(staff_id, day) pairs on the invalidation bus under `SALARY_TOPIC`, a null day means
+every report of the staff. Only reports of that staff whose range covers the day are
+evicted.
+"""
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import REPORT_CACHE_SIZE
+from src.db import Lesson as LessonTable
+from src.db import LessonDog as LessonDogTable
+from src.db import LessonStaff as LessonStaffTable
+from src.db import Staff as StaffTable
+
+from . import invalidation
+
+SALARY_TOPIC = "salary"
+
+ReportKey = tuple[int, date, date]
+# [staff_id, ISO day or None], lists so that the pairs survive a NOTIFY round trip
+AffectedReport = list[Any]
+ReportKeysQuery = Callable[
+    [AsyncSession, Sequence[int], Sequence[str] | None],
+    Awaitable[list[AffectedReport]],
+]
+
+PRICE_COLUMNS = ("big_dog_price", "low_dog_price", "group_price")
+
+
+class ReportCache:
+    """Bounded LRU of report values with an index by staff for selective eviction.
+
+    Every invalidation bumps the version of the staff, a value computed before that is
+    not stored: `set` takes the `version` read before the report was computed.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[ReportKey, Any] = OrderedDict()
+        self._by_staff: dict[int, set[ReportKey]] = {}
+        self._epoch = 0
+        self._staff_versions: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: ReportKey) -> Any:
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._entries[key]
+
+    def version(self, staff_id: int) -> tuple[int, int]:
+        return self._epoch, self._staff_versions.get(staff_id, 0)
+
+    def set(self, key: ReportKey, value: Any, version: tuple[int, int]) -> None:
+        # An invalidation arrived while the value was computed, it may be outdated
+        if self.maxsize <= 0 or version != self.version(key[0]):
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._by_staff.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, staff_id: int, day: date | None) -> None:
+        self._staff_versions[staff_id] = self._staff_versions.get(staff_id, 0) + 1
+        keys = self._by_staff.get(staff_id, set())
+        for key in [key for key in keys if day is None or key[1] <= day <= key[2]]:
+            self._remove(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._staff_versions.clear()
+        self._entries.clear()
+        self._by_staff.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+        }
+
+    def _remove(self, key: ReportKey) -> None:
+        del self._entries[key]
+        staff_keys = self._by_staff[key[0]]
+        staff_keys.discard(key)
+        if not staff_keys:
+            del self._by_staff[key[0]]
+
+
+report_cache = ReportCache(REPORT_CACHE_SIZE)
+
+
+def _on_invalidate(_topic: str, affected: list[Any] | None) -> None:
+    if affected is None:
+        report_cache.clear()
+        return
+
+    for staff_id, day in affected:
+        report_cache.invalidate(staff_id, date.fromisoformat(day) if day else None)
+
+
+invalidation.subscribe([SALARY_TOPIC], _on_invalidate, report_cache.clear)
+
+
+async def _staff_days(session: AsyncSession, query: Select[Any]) -> list[AffectedReport]:
+    rows = await session.execute(query.distinct())
+    return [
+        [staff_id, lesson_date.date().isoformat() if isinstance(lesson_date, datetime) else None]
+        for staff_id, lesson_date in rows
+        if staff_id is not None
+    ]
+
+
+def _lesson_staff_days() -> Select[Any]:
+    return select(LessonStaffTable.staff_id, LessonTable.date).join(
+        LessonTable,
+        LessonTable.id == LessonStaffTable.lesson_id,
+    )
+
+
+async def lesson_report_keys(
+    session: AsyncSession,
+    ids: Sequence[int],
+    _columns: Sequence[str] | None,
+) -> list[AffectedReport]:
+    return await _staff_days(session, _lesson_staff_days().where(LessonTable.id.in_(ids)))
+
+
+async def lesson_staff_report_keys(
+    session: AsyncSession,
+    ids: Sequence[int],
+    _columns: Sequence[str] | None,
+) -> list[AffectedReport]:
+    return await _staff_days(session, _lesson_staff_days().where(LessonStaffTable.id.in_(ids)))
+
+
+async def lesson_dog_report_keys(
+    session: AsyncSession,
+    ids: Sequence[int],
+    _columns: Sequence[str] | None,
+) -> list[AffectedReport]:
+    return await _staff_days(
+        session,
+        _lesson_staff_days()
+        .join(LessonDogTable, LessonDogTable.lesson_id == LessonTable.id)
+        .where(LessonDogTable.id.in_(ids)),
+    )
+
+
+async def dog_report_keys(
+    session: AsyncSession,
+    ids: Sequence[int],
+    columns: Sequence[str] | None,
+) -> list[AffectedReport]:
+    # Only the dog size changes prices, deleting a dog drops its lessons from reports
+    if columns is not None and "is_big" not in columns:
+        return []
+    return await _staff_days(
+        session,
+        _lesson_staff_days()
+        .join(LessonDogTable, LessonDogTable.lesson_id == LessonTable.id)
+        .where(LessonDogTable.dog_id.in_(ids)),
+    )
+
+
+async def staff_report_keys(
+    _session: AsyncSession,
+    ids: Sequence[int],
+    columns: Sequence[str] | None,
+) -> list[AffectedReport]:
+    # The staff ids are the keys themselves, nothing is queried
+    if columns is not None and "status" not in columns:
+        return []
+    return [[staff_id, None] for staff_id in ids]
+
+
+async def staff_status_report_keys(
+    session: AsyncSession,
+    ids: Sequence[int],
+    columns: Sequence[str] | None,
+) -> list[AffectedReport]:
+    if columns is not None and not set(PRICE_COLUMNS) & set(columns):
+        return []
+    staff_ids = await session.scalars(select(StaffTable.id).where(StaffTable.status.in_(ids)))
+    return [[staff_id, None] for staff_id in staff_ids]
@@ -0,0 +1,256 @@
+"""Per-staff, per-day salary ledger.
+
+Every (staff_id, day) cell holds the lessons of the day, dogs per kind and the amount.
+Writes that can change a salary recompute only the cells they affect (see
+`report_cache` for how those are found), so a salary is a sum over the ledger rows of
+the range instead of a join over the whole lesson history.
+"""
+
+from collections.abc import Collection, Sequence
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Numeric,
+    Select,
+    and_,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    not_,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.db import Dog as DogTable
+from src.db import Lesson as LessonTable
+from src.db import LessonDog as LessonDogTable
+from src.db import LessonStaff as LessonStaffTable
+from src.db import SalaryLedger as SalaryLedgerTable
+from src.db import Staff as StaffTable
+from src.db import StaffStatus as StaffStatusTable
+
+from .report_cache import AffectedReport
+
+# Kinds of the salary breakdown: (dogs column of the ledger, price column of the status)
+BREAKDOWN_KINDS = {
+    "group": ("group_dogs", "group_price"),
+    "big_dog": ("big_dogs", "big_dog_price"),
+    "low_dog": ("low_dogs", "low_dog_price"),
+}
+LEDGER_COLUMNS = ("staff_id", "day", "lesson_count", "group_dogs", "big_dogs", "low_dogs", "amount")
+# Salary of a staff member without lessons in the range
+NO_LESSONS_SALARY = -1
+# Cells are recomputed in chunks to keep the row-value IN lists short
+CELLS_PER_QUERY = 500
+
+# date() is understood by both PostgreSQL and SQLite, a CAST to DATE is not
+lesson_day = func.date(LessonTable.date, type_=Date)
+
+
+def _count(condition: ColumnElement[bool]) -> ColumnElement[int]:
+    return func.sum(case((condition, 1), else_=0))
+
+
+def _price(column: Any) -> ColumnElement[Any]:
+    # money has no arithmetic with plain numbers on PostgreSQL
+    return cast(column, Numeric(12, 2, asdecimal=False))
+
+
+def _aggregates() -> list[ColumnElement[Any]]:
+    is_group = LessonTable.is_group
+    # Lessons without dogs are outer joined, they are counted but not paid
+    has_dog = DogTable.id.is_not(None)
+    return [
+        func.count(LessonTable.id.distinct()).label("lesson_count"),
+        _count(and_(has_dog, is_group)).label("group_dogs"),
+        _count(and_(has_dog, not_(is_group), DogTable.is_big)).label("big_dogs"),
+        _count(and_(has_dog, not_(is_group), not_(DogTable.is_big))).label("low_dogs"),
+        func.sum(
+            case(
+                (not_(has_dog), 0),
+                (is_group, _price(StaffStatusTable.group_price)),
+                (DogTable.is_big, _price(StaffStatusTable.big_dog_price)),
+                else_=_price(StaffStatusTable.low_dog_price),
+            ),
+        ).label("amount"),
+    ]
+
+
+def _join_lessons(query: Select[Any]) -> Select[Any]:
+    return (
+        query.join(LessonTable, LessonTable.id == LessonStaffTable.lesson_id)
+        .outerjoin(LessonDogTable, LessonDogTable.lesson_id == LessonTable.id)
+        .outerjoin(DogTable, DogTable.id == LessonDogTable.dog_id)
+        .join(StaffTable, StaffTable.id == LessonStaffTable.staff_id)
+        .join(StaffStatusTable, StaffStatusTable.id == StaffTable.status)
+    )
+
+
+def ledger_query(*conditions: ColumnElement[bool]) -> Select[Any]:
+    """Aggregate lessons into ledger cells, every attending dog is paid separately."""
+    return (
+        _join_lessons(select(LessonStaffTable.staff_id, lesson_day.label("day"), *_aggregates()))
+        .where(*conditions)
+        .group_by(LessonStaffTable.staff_id, lesson_day)
+    )
+
+
+async def _replace(
+    session: AsyncSession | AsyncConnection,
+    ledger_condition: ColumnElement[bool] | None,
+    lesson_conditions: Sequence[ColumnElement[bool]],
+) -> None:
+    delete_query = delete(SalaryLedgerTable)
+    if ledger_condition is not None:
+        delete_query = delete_query.where(ledger_condition)
+    await session.execute(delete_query)
+    await session.execute(
+        insert(SalaryLedgerTable).from_select(LEDGER_COLUMNS, ledger_query(*lesson_conditions)),
+    )
+
+
+async def _lock_staff(
+    session: AsyncSession | AsyncConnection,
+    staff_ids: Collection[int] | None,
+) -> None:
+    # Writers of the same staff cells run one at a time, each recomputes them from the
+    # data committed before it. NO KEY UPDATE doesn't block inserting links to the staff.
+    query = select(StaffTable.id).order_by(StaffTable.id).with_for_update(key_share=True)
+    if staff_ids is not None:
+        query = query.where(StaffTable.id.in_(sorted(staff_ids)))
+    await session.execute(query)
+
+
+async def rebuild(session: AsyncSession | AsyncConnection) -> None:
+    await _lock_staff(session, None)
+    await _replace(session, None, [])
+
+
+async def refresh(session: AsyncSession, affected: list[AffectedReport] | None) -> None:
+    """Recompute the cells of `affected` pairs, `None` rebuilds the whole ledger."""
+    if affected is None:
+        await rebuild(session)
+        return
+
+    if not affected:
+        return
+    await _lock_staff(session, {staff_id for staff_id, _ in affected})
+
+    staff_ids = {staff_id for staff_id, day in affected if day is None}
+    if staff_ids:
+        await _replace(
+            session,
+            SalaryLedgerTable.staff_id.in_(staff_ids),
+            [LessonStaffTable.staff_id.in_(staff_ids)],
+        )
+
+    cells = sorted(
+        {
+            (staff_id, date.fromisoformat(day))
+            for staff_id, day in affected
+            if day is not None and staff_id not in staff_ids
+        },
+    )
+    for start in range(0, len(cells), CELLS_PER_QUERY):
+        chunk = cells[start : start + CELLS_PER_QUERY]
+        days = [day for _, day in chunk]
+        await _replace(
+            session,
+            tuple_(SalaryLedgerTable.staff_id, SalaryLedgerTable.day).in_(chunk),
+            [
+                # The plain date range lets the lessons.date index narrow the scan
+                LessonTable.date >= datetime.combine(min(days), time.min),
+                LessonTable.date < datetime.combine(max(days) + timedelta(days=1), time.min),
+                tuple_(LessonStaffTable.staff_id, lesson_day).in_(chunk),
+            ],
+        )
+
+
+async def get_amount(
+    session: AsyncSession,
+    staff_id: int,
+    start_date: date,
+    end_date: date,
+) -> float | None:
+    """Sum of the staff's cells from `start_date` up to `end_date` exclusive."""
+    return (
+        await session.execute(
+            select(func.sum(SalaryLedgerTable.amount)).where(
+                SalaryLedgerTable.staff_id == staff_id,
+                SalaryLedgerTable.day >= start_date,
+                SalaryLedgerTable.day < end_date,
+            ),
+        )
+    ).scalar()
+
+
+def report_query(start_date: date, end_date: date, breakdown: bool = False) -> Select[Any]:
+    """Salaries of every staff member in one pass over the ledger cells of the range."""
+    ledger = SalaryLedgerTable.__table__.c
+    columns: list[ColumnElement[Any]] = [
+        StaffTable.id.label("staff_id"),
+        StaffTable.name,
+        func.coalesce(func.sum(ledger.lesson_count), 0).label("lesson_count"),
+        func.coalesce(func.sum(ledger.amount), NO_LESSONS_SALARY).label("salary"),
+    ]
+    if breakdown:
+        for kind, (dogs_column, price_column) in BREAKDOWN_KINDS.items():
+            price = _price(StaffStatusTable.__table__.c[price_column])
+            columns += [
+                func.coalesce(func.sum(ledger[dogs_column]), 0).label(f"{kind}_dogs"),
+                func.coalesce(func.sum(ledger[dogs_column] * price), 0).label(f"{kind}_amount"),
+            ]
+
+    return (
+        select(*columns)
+        .join(StaffStatusTable, StaffStatusTable.id == StaffTable.status)
+        .outerjoin(
+            SalaryLedgerTable,
+            and_(
+                ledger.staff_id == StaffTable.id,
+                ledger.day >= start_date,
+                ledger.day < end_date,
+            ),
+        )
+        .group_by(StaffTable.id)
+        .order_by(StaffTable.id)
+    )
+
+
+async def check(session: AsyncSession) -> list[dict[str, Any]]:
+    """Compare the ledger with a full recomputation, return the differing cells."""
+    columns = LEDGER_COLUMNS[2:]
+
+    def as_cell(values: tuple[Any, ...] | None) -> dict[str, Any] | None:
+        return dict(zip(columns, values, strict=True)) if values else None
+
+    stored = {
+        (row.staff_id, row.day): tuple(row[2:])
+        for row in await session.execute(
+            select(*(SalaryLedgerTable.__table__.c[column] for column in LEDGER_COLUMNS)),
+        )
+    }
+    expected = {
+        (row.staff_id, row.day): tuple(row[2:]) for row in await session.execute(ledger_query())
+    }
+
+    mismatches = []
+    for staff_id, day in sorted(stored.keys() | expected.keys()):
+        stored_values = stored.get((staff_id, day))
+        expected_values = expected.get((staff_id, day))
+        if stored_values != expected_values:
+            mismatches.append(
+                {
+                    "staff_id": staff_id,
+                    "day": day.isoformat(),
+                    "stored": as_cell(stored_values),
+                    "expected": as_cell(expected_values),
+                },
+            )
+    return mismatches
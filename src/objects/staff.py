@@ -1,14 +1,23 @@
-from datetime import date
-from typing import Annotated, Any
+from datetime import date, datetime, time, timedelta
+from typing import Annotated, Any, ClassVar
 
 from dateutil.relativedelta import relativedelta
 from pydantic import BaseModel, StringConstraints
-from sqlalchemy import text
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db import Customer as CustomerTable
+from src.db import Dog as DogTable
+from src.db import Lesson as LessonTable
+from src.db import LessonDog as LessonDogTable
+from src.db import LessonStaff as LessonStaffTable
 from src.db import Staff as StaffTable
+from src.db import StaffStatus as StaffStatusTable
 
-from .abstract_object import AbstrackPesopolisObject
+from . import salary_ledger
+from .abstract_object import AbstrackPesopolisObject, GetOneParamsModel, GetParamsModel
+from .relations import ManyToMany, ManyToOne, Relation
+from .report_cache import report_cache, staff_report_keys
 
 
 class StaffModel(BaseModel):
@@ -23,9 +32,92 @@ class GetSalaryResponseModel(BaseModel):
     salary: float
 
 
+class SalaryBreakdownModel(BaseModel):
+    dogs: int
+    amount: float
+
+
+class StaffSalaryModel(BaseModel):
+    staff_id: int
+    name: str
+    lesson_count: int
+    salary: float
+    breakdown: dict[str, SalaryBreakdownModel] | None = None
+
+
+class GetSalaryReportResponseModel(BaseModel):
+    start_date: date
+    end_date: date
+    items: list[StaffSalaryModel]
+
+
+class ScheduleOwnerModel(BaseModel):
+    id: int
+    name: str
+    phone: str | None
+
+
+class ScheduleDogModel(BaseModel):
+    id: int
+    name: str
+    breed: str
+    is_big: bool
+    owner: ScheduleOwnerModel
+
+
+class ScheduleLessonModel(BaseModel):
+    id: int
+    date: datetime
+    is_group: bool
+    dogs: list[ScheduleDogModel]
+
+
+class StaffScheduleModel(BaseModel):
+    staff_id: int
+    date: date
+    lessons: list[ScheduleLessonModel]
+
+
+class GetSchedulesResponseModel(BaseModel):
+    date: date
+    items: list[StaffScheduleModel]
+
+
+def _schedule_query(day: date) -> Select[Any]:
+    # A range on lessons.date keeps the date index usable, a cast of the column would not
+    start = datetime.combine(day, time.min)
+    return (
+        select(
+            LessonStaffTable.staff_id,
+            LessonTable.id.label("lesson_id"),
+            LessonTable.date,
+            LessonTable.is_group,
+            DogTable.id.label("dog_id"),
+            DogTable.name.label("dog_name"),
+            DogTable.breed,
+            DogTable.is_big,
+            CustomerTable.id.label("owner_id"),
+            CustomerTable.name.label("owner_name"),
+            CustomerTable.phone.label("owner_phone"),
+        )
+        .join(LessonTable, LessonTable.id == LessonStaffTable.lesson_id)
+        .outerjoin(LessonDogTable, LessonDogTable.lesson_id == LessonTable.id)
+        .outerjoin(DogTable, DogTable.id == LessonDogTable.dog_id)
+        .outerjoin(CustomerTable, CustomerTable.id == DogTable.owner)
+        .where(LessonTable.date >= start, LessonTable.date < start + timedelta(days=1))
+        .order_by(LessonStaffTable.staff_id, LessonTable.date, LessonTable.id, DogTable.id)
+    )
+
+
 class Staff(AbstrackPesopolisObject):
     _table_class = StaffTable
     _model_class = StaffModel
+    _report_keys = staticmethod(staff_report_keys)
+    _cacheable = True
+    _relations: ClassVar[dict[str, Relation]] = {
+        "status": ManyToOne("status", StaffStatusTable),
+        "lessons": ManyToMany(LessonStaffTable, "staff_id", "lesson_id", LessonTable),
+    }
 
     def __init__(self, staff_id: int) -> None:
         super().__init__()
@@ -44,20 +136,29 @@ class Staff(AbstrackPesopolisObject):
     async def create_many(
         cls,
         session: AsyncSession,
-        data: list[dict[str, Any]],
+        data: list[dict[str, Any]] | bytes,
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
         return await super().create_many(session, data, from_other_object)
 
     @classmethod
-    async def get(cls, session: AsyncSession, data: dict[str, Any] | None) -> list[dict[str, Any]]:
-        return await super().get(session, data)
+    async def get(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+    ) -> dict[str, Any]:
+        return await super().get(session, data, params)
 
     @classmethod
     async def get_one(
-        cls, session: AsyncSession, object_id: int, data: dict[str, Any] | None
+        cls,
+        session: AsyncSession,
+        object_id: int,
+        data: dict[str, Any] | None,
+        params: GetOneParamsModel | None = None,
     ) -> dict[str, Any]:
-        return await super().get_one(session, object_id, data)
+        return await super().get_one(session, object_id, data, params)
 
     @classmethod
     async def update(
@@ -99,41 +200,112 @@ class Staff(AbstrackPesopolisObject):
         start_date: date,
         end_date: date | None = None,
     ) -> GetSalaryResponseModel:
-        query = """
-            WITH data AS (
-                SELECT CASE
-                    WHEN l.is_group THEN s_s.group_price
-                    WHEN d.is_big THEN s_s.big_dog_price
-                    ELSE s_s.low_dog_price
-                END price
-                FROM lessons l
-                JOIN lessons_staff l_s
-                    ON l.id = l_s.lesson_id
-                JOIN staffs s
-                    ON s.id = l_s.staff_id
-                JOIN staff_status s_s
-                    ON s_s.id = s.status
-                JOIN dogs d
-                    ON l.dog_id = d.id
-                WHERE l_s.staff_id = :staff_id
-                    AND l.date BETWEEN :start_date AND :end_date
-            )
-            SELECT SUM(price)
-            FROM data;
-        """
+        if not end_date:
+            end_date = start_date + relativedelta(months=1)
 
+        cache_key = (self.id, start_date, end_date)
+        cached = report_cache.get(cache_key)
+        if cached is not None:
+            return GetSalaryResponseModel(salary=cached)
+        version = report_cache.version(self.id)
+
+        amount = await salary_ledger.get_amount(session, self.id, start_date, end_date)
+        salary = salary_ledger.NO_LESSONS_SALARY if amount is None else amount
+
+        report_cache.set(cache_key, salary, version)
+        return GetSalaryResponseModel(salary=salary)
+
+    @classmethod
+    async def get_salary_report(
+        cls,
+        session: AsyncSession,
+        start_date: date,
+        end_date: date | None = None,
+        breakdown: bool = False,
+    ) -> GetSalaryReportResponseModel:
         if not end_date:
             end_date = start_date + relativedelta(months=1)
 
-        salary = (
-            await session.execute(
-                text(query),
-                params={
-                    "staff_id": self.id,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                },
+        rows = await session.execute(salary_ledger.report_query(start_date, end_date, breakdown))
+        items = []
+        for row in rows.mappings():
+            item = StaffSalaryModel(
+                staff_id=row["staff_id"],
+                name=row["name"],
+                lesson_count=row["lesson_count"],
+                salary=row["salary"],
             )
-        ).scalar() or -1
+            if breakdown:
+                item.breakdown = {
+                    kind: SalaryBreakdownModel(
+                        dogs=row[f"{kind}_dogs"],
+                        amount=row[f"{kind}_amount"],
+                    )
+                    for kind in salary_ledger.BREAKDOWN_KINDS
+                }
+            items.append(item)
 
-        return GetSalaryResponseModel(salary=salary)
+        return GetSalaryReportResponseModel(start_date=start_date, end_date=end_date, items=items)
+
+    async def get_schedule(self, session: AsyncSession, day: date) -> StaffScheduleModel:
+        schedules = await self._get_schedules(
+            session,
+            _schedule_query(day).where(LessonStaffTable.staff_id == self.id),
+            day,
+        )
+        return (
+            schedules[0]
+            if schedules
+            else StaffScheduleModel(staff_id=self.id, date=day, lessons=[])
+        )
+
+    @classmethod
+    async def get_schedules(cls, session: AsyncSession, day: date) -> GetSchedulesResponseModel:
+        return GetSchedulesResponseModel(
+            date=day,
+            items=await cls._get_schedules(session, _schedule_query(day), day),
+        )
+
+    @staticmethod
+    async def _get_schedules(
+        session: AsyncSession,
+        query: Select[Any],
+        day: date,
+    ) -> list[StaffScheduleModel]:
+        # Rows come ordered by staff and lesson, one row per attending dog
+        schedules: dict[int, StaffScheduleModel] = {}
+        lessons: dict[tuple[int, int], ScheduleLessonModel] = {}
+        for row in await session.execute(query):
+            schedule = schedules.get(row.staff_id)
+            if schedule is None:
+                schedule = schedules[row.staff_id] = StaffScheduleModel(
+                    staff_id=row.staff_id,
+                    date=day,
+                    lessons=[],
+                )
+
+            lesson = lessons.get((row.staff_id, row.lesson_id))
+            if lesson is None:
+                lesson = lessons[(row.staff_id, row.lesson_id)] = ScheduleLessonModel(
+                    id=row.lesson_id,
+                    date=row.date,
+                    is_group=row.is_group,
+                    dogs=[],
+                )
+                schedule.lessons.append(lesson)
+
+            if row.dog_id is not None:
+                lesson.dogs.append(
+                    ScheduleDogModel(
+                        id=row.dog_id,
+                        name=row.dog_name,
+                        breed=row.breed,
+                        is_big=row.is_big,
+                        owner=ScheduleOwnerModel(
+                            id=row.owner_id,
+                            name=row.owner_name,
+                            phone=row.owner_phone,
+                        ),
+                    ),
+                )
+        return list(schedules.values())
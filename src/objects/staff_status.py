@@ -1,11 +1,14 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, ClassVar
 
 from pydantic import BaseModel, StringConstraints
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db import Staff as StaffTable
 from src.db import StaffStatus as StaffStatusTable
 
-from .abstract_object import AbstrackPesopolisObject
+from .abstract_object import AbstrackPesopolisObject, GetOneParamsModel, GetParamsModel
+from .relations import OneToMany, Relation
+from .report_cache import staff_status_report_keys
 
 
 class StaffStatusModel(BaseModel):
@@ -19,6 +22,12 @@ class StaffStatusModel(BaseModel):
 class StaffStatus(AbstrackPesopolisObject):
     _table_class = StaffStatusTable
     _model_class = StaffStatusModel
+    _report_keys = staticmethod(staff_status_report_keys)
+    _cacheable = True
+    _from_snapshot = True
+    _relations: ClassVar[dict[str, Relation]] = {
+        "staffs": OneToMany(StaffTable, "status"),
+    }
 
     @classmethod
     async def create(
@@ -33,20 +42,29 @@ class StaffStatus(AbstrackPesopolisObject):
     async def create_many(
         cls,
         session: AsyncSession,
-        data: list[dict[str, Any]],
+        data: list[dict[str, Any]] | bytes,
         from_other_object: bool = False,
     ) -> dict[str, list[int]]:
         return await super().create_many(session, data, from_other_object)
 
     @classmethod
-    async def get(cls, session: AsyncSession, data: dict[str, Any] | None) -> list[dict[str, Any]]:
-        return await super().get(session, data)
+    async def get(
+        cls,
+        session: AsyncSession,
+        data: dict[str, Any] | None,
+        params: GetParamsModel,
+    ) -> dict[str, Any]:
+        return await super().get(session, data, params)
 
     @classmethod
     async def get_one(
-        cls, session: AsyncSession, object_id: int, data: dict[str, Any] | None
+        cls,
+        session: AsyncSession,
+        object_id: int,
+        data: dict[str, Any] | None,
+        params: GetOneParamsModel | None = None,
     ) -> dict[str, Any]:
-        return await super().get_one(session, object_id, data)
+        return await super().get_one(session, object_id, data, params)
 
     @classmethod
     async def update(
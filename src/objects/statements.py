@@ -0,0 +1,43 @@
+from typing import Any
+
+from sqlalchemy import Table, Update, bindparam, update
+
+
+class UpdateStatementCache:
+    """UPDATE ... WHERE id = :_id statements keyed by (table, column set).
+
+    Reusing the same statement object lets SQLAlchemy find its compiled form in the
+    engine's compiled cache, so a request only binds parameters. Columns are bound as
+    `_<column>` because `id` and the column names are taken by the statement itself.
+    """
+
+    def __init__(self) -> None:
+        self._statements: dict[tuple[str, tuple[str, ...]], Update] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, table: Table, columns: tuple[str, ...]) -> Update:
+        key = (table.name, columns)
+        statement = self._statements.get(key)
+        if statement is not None:
+            self.hits += 1
+            return statement
+
+        self.misses += 1
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values({column: bindparam(f"_{column}") for column in columns})
+        )
+        self._statements[key] = statement
+        return statement
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._statements)}
+
+
+def update_params(object_id: int, values: dict[str, Any]) -> dict[str, Any]:
+    return {"_id": object_id, **{f"_{column}": value for column, value in values.items()}}
+
+
+update_statements = UpdateStatementCache()
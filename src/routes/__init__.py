@@ -1,2 +1,4 @@
+from .lessons import lesson_router
 from .object_routes import object_router
 from .reports import report_router
+from .stats import stats_router
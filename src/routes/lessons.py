@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db import get_session
+from src.objects import Lesson
+from src.objects.lesson import LessonWithParticipantsModel
+
+lesson_router = APIRouter()
+
+WITH_PARTICIPANTS_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "array",
+                    "items": LessonWithParticipantsModel.model_json_schema(),
+                },
+            },
+        },
+    },
+}
+
+
+@lesson_router.post("/lessons/with_participants")
+async def create_lesson_with_participants(
+    data: dict,
+    # authorization: str = Header(),
+    session: AsyncSession = Depends(get_session),
+) -> ORJSONResponse:
+    res = await Lesson.create_with_participants(session, data)
+    return ORJSONResponse(res)
+
+
+@lesson_router.post("/lessons/with_participants/many", openapi_extra=WITH_PARTICIPANTS_BODY)
+async def create_lessons_with_participants(
+    request: Request,
+    # authorization: str = Header(),
+    session: AsyncSession = Depends(get_session),
+) -> ORJSONResponse:
+    res = await Lesson.create_many_with_participants(session, await request.body())
+    return ORJSONResponse(res)
@@ -1,36 +1,93 @@
+from typing import Literal
+
 import orjson
-from fastapi import APIRouter, Depends, Header
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from src.db import get_session
 from src.factories import BaseFactory
-from src.objects import AbstrackPesopolisObject
+from src.objects import (
+    AbstrackPesopolisObject,
+    FieldsList,
+    GetOneParamsModel,
+    GetParamsModel,
+)
 
 object_router = APIRouter()
 
+# Bodies read raw are declared here, FastAPI only documents the ones it parses
+MANY_OBJECTS_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+        },
+    },
+}
+NDJSON_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+    },
+}
+
+
+class GetObjectRequestModel(GetOneParamsModel):
+    fields: FieldsList = Field(Query(default=None))
+    expand: FieldsList = Field(Query(default=None))
+
+
+class GetObjectsRequestModel(GetParamsModel):
+    fields: FieldsList = Field(Query(default=None))
+    expand: FieldsList = Field(Query(default=None))
+    limit: int = Field(Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE))
+    cursor: str | None = Field(Query(default=None))
+    ids: list[int] | None = Field(Query(default=None, max_length=MAX_PAGE_SIZE))
+    render: Literal["python", "db"] = Field(Query(default="python"))
+
 
 # TODO add pydentic objects
 @object_router.get("/{object_name}")
 async def get_objects(
     object_name: str,
     data: str = "{}",
+    query_data: GetObjectsRequestModel = Depends(),
     session: AsyncSession = Depends(get_session),
 ) -> ORJSONResponse:
     object_class: AbstrackPesopolisObject = BaseFactory.get(object_name)
-    res = await object_class.get(session, orjson.loads(data))
+    res = await object_class.get(session, orjson.loads(data), query_data)
     return ORJSONResponse(res)
 
 
+@object_router.get("/{object_name}/export")
+async def export_objects(
+    object_name: str,
+    *,
+    data: str = "{}",
+    export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+    render: Literal["python", "db"] = Query(default="python"),
+    query_data: GetObjectRequestModel = Depends(),
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    object_class: AbstrackPesopolisObject = BaseFactory.get(object_name)
+    res = object_class.export(session, orjson.loads(data), query_data.fields, export_format, render)
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(res, media_type=media_type)
+
+
 @object_router.get("/{object_name}/{object_id}")
 async def get_object(
     object_name: str,
     object_id: int,
     data: str = "{}",
+    query_data: GetObjectRequestModel = Depends(),
     session: AsyncSession = Depends(get_session),
 ) -> ORJSONResponse:
     object_class: AbstrackPesopolisObject = BaseFactory.get(object_name)
-    res = await object_class.get_one(session, object_id, orjson.loads(data))
+    res = await object_class.get_one(session, object_id, orjson.loads(data), query_data)
     return ORJSONResponse(res)
 
 
@@ -46,15 +103,29 @@ async def create_object(
     return ORJSONResponse(res)
 
 
-@object_router.post("/{object_name}/many")
+@object_router.post("/{object_name}/many", openapi_extra=MANY_OBJECTS_BODY)
 async def create_objects(
     object_name: str,
-    data: list[dict],
+    request: Request,
+    # authorization: str = Header(),
+    session: AsyncSession = Depends(get_session),
+) -> ORJSONResponse:
+    object_class: AbstrackPesopolisObject = BaseFactory.get(object_name)
+    # The raw body is validated by the object's model in one pass
+    res = await object_class.create_many(session, await request.body())
+    return ORJSONResponse(res)
+
+
+@object_router.post("/{object_name}/import", openapi_extra=NDJSON_BODY)
+async def import_objects(
+    object_name: str,
+    request: Request,
+    chunk_size: int | None = Query(default=None, ge=1),
     # authorization: str = Header(),
     session: AsyncSession = Depends(get_session),
 ) -> ORJSONResponse:
     object_class: AbstrackPesopolisObject = BaseFactory.get(object_name)
-    res = await object_class.create_many(session, data)
+    res = await object_class.import_ndjson(session, request.stream(), chunk_size)
     return ORJSONResponse(res)
 
 
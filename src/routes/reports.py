@@ -5,7 +5,13 @@ from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db import get_session
-from src.objects.staff import GetSalaryResponseModel, Staff
+from src.objects.staff import (
+    GetSalaryReportResponseModel,
+    GetSalaryResponseModel,
+    GetSchedulesResponseModel,
+    Staff,
+    StaffScheduleModel,
+)
 
 report_router = APIRouter()
 
@@ -15,6 +21,23 @@ class GetSalaryRequestModel(BaseModel):
     end_date: date | None = Field(Query(default=None))
 
 
+class GetSalaryReportRequestModel(GetSalaryRequestModel):
+    breakdown: bool = Field(Query(default=False))
+
+
+@report_router.get("/reports/salary")
+async def get_salary_report(
+    query_data: GetSalaryReportRequestModel = Depends(),
+    session: AsyncSession = Depends(get_session),
+) -> GetSalaryReportResponseModel:
+    return await Staff.get_salary_report(
+        session,
+        start_date=query_data.start_date,
+        end_date=query_data.end_date,
+        breakdown=query_data.breakdown,
+    )
+
+
 @report_router.get("/staff/{staff_id}/salary")
 async def get_salary(
     staff_id: int,
@@ -26,3 +49,20 @@ async def get_salary(
         session, start_date=query_data.start_date, end_date=query_data.end_date
     )
     return res
+
+
+@report_router.get("/staff/schedule")
+async def get_schedules(
+    day: date = Query(alias="date"),
+    session: AsyncSession = Depends(get_session),
+) -> GetSchedulesResponseModel:
+    return await Staff.get_schedules(session, day)
+
+
+@report_router.get("/staff/{staff_id}/schedule")
+async def get_schedule(
+    staff_id: int,
+    day: date = Query(alias="date"),
+    session: AsyncSession = Depends(get_session),
+) -> StaffScheduleModel:
+    return await Staff(staff_id).get_schedule(session, day)
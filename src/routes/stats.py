@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+
+from src.objects.cache import object_cache
+from src.objects.report_cache import report_cache
+from src.objects.statements import update_statements
+
+stats_router = APIRouter()
+
+
+@stats_router.get("/stats/statements")
+async def get_statement_stats() -> ORJSONResponse:
+    return ORJSONResponse({"update": update_statements.stats()})
+
+
+@stats_router.get("/stats/cache")
+async def get_cache_stats() -> ORJSONResponse:
+    return ORJSONResponse({"objects": object_cache.stats(), "reports": report_cache.stats()})
@@ -1,5 +1,6 @@
 from collections.abc import AsyncGenerator
 
+import pytest
 import pytest_asyncio
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
@@ -16,6 +17,10 @@ from sqlalchemy.ext.asyncio import (
 from src.app import create_application
 from src.config import TEST_DATABASE_URL
 from src.db.database import Base, get_session
+from src.objects import salary_ledger
+from src.objects.cache import object_cache
+from src.objects.reference import reference_data
+from src.objects.report_cache import report_cache
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -112,6 +117,9 @@ async def prepopulate_db(async_engine: AsyncEngine) -> None:
             ls.staff_id = ls.staff_id.id
             ls.lesson_id = ls.lesson_id.id
         session.add_all(test_lesson_dog + test_lesson_staff)
+        await session.flush()
+
+        await salary_ledger.rebuild(session)
         await session.commit()
 
 
@@ -127,6 +135,14 @@ async def override_app(db_session: AsyncSession) -> FastAPI:
     return app
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_object_cache() -> None:
+    """Кэши объектов не должны переживать откат транзакции теста."""
+    object_cache.clear()
+    reference_data.reset()
+    report_cache.clear()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def client(override_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
     """Фикстура для создания клиента HTTP для тестов."""
@@ -138,3 +154,5 @@ async def client(override_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
 
 
 HTTP_OK = 200
+HTTP_CONFLICT = 409
+HTTP_UNPROCESSABLE_ENTITY = 422
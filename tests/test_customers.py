@@ -54,6 +54,26 @@ class TestCustomers:
         response = await client.get(f"/{MODULE_NAME}/customers/1")
         assert response.status_code == HTTP_OK
 
+    @pytest.mark.asyncio
+    async def test_get_cached(self, client: AsyncClient) -> None:
+        response = await client.get(f"/{MODULE_NAME}/stats/cache")
+        before = response.json()["objects"]
+
+        first = (await client.get(f"/{MODULE_NAME}/customers/2")).json()
+        response = await client.get(f"/{MODULE_NAME}/customers/2", params={"fields": "name"})
+        assert response.json() == {"name": first["name"]}
+
+        response = await client.get(f"/{MODULE_NAME}/stats/cache")
+        after = response.json()["objects"]
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+
+        # A write evicts the cached row
+        response = await client.put(f"/{MODULE_NAME}/customers/2", json={"name": "Anna"})
+        assert response.status_code == HTTP_OK
+        response = await client.get(f"/{MODULE_NAME}/customers/2")
+        assert response.json() == {**first, "name": "Anna"}
+
     @pytest.mark.asyncio
     async def test_create(
         self, client: AsyncClient, test_customer: Any, db_session: AsyncSession
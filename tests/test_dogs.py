@@ -1,5 +1,6 @@
 from typing import Any
 
+import orjson
 import pytest
 from httpx import AsyncClient
 from sqlalchemy import text
@@ -7,8 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import bindparam
 
 from src.config import MODULE_NAME
+from src.exceptions import PesopolistException
 
-from .conftest import HTTP_OK
+from .conftest import HTTP_OK, HTTP_UNPROCESSABLE_ENTITY
 
 
 @pytest.fixture(scope="function")
@@ -62,6 +64,76 @@ class TestDogs:
         response = await client.get(f"/{MODULE_NAME}/dogs/1")
         assert response.status_code == HTTP_OK
 
+    @pytest.mark.asyncio
+    async def test_get_list(self, client: AsyncClient) -> None:
+        response = await client.get(f"/{MODULE_NAME}/dogs", params={"limit": 3})
+        assert response.status_code == HTTP_OK
+        first_page = response.json()
+        assert [dog["id"] for dog in first_page["items"]] == [1, 2, 3]
+        assert first_page["next_cursor"]
+
+        response = await client.get(
+            f"/{MODULE_NAME}/dogs",
+            params={"limit": 3, "cursor": first_page["next_cursor"]},
+        )
+        assert response.status_code == HTTP_OK
+        second_page = response.json()
+        assert [dog["id"] for dog in second_page["items"]] == [4]
+        assert second_page["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_by_ids(self, client: AsyncClient) -> None:
+        response = await client.get(
+            f"/{MODULE_NAME}/dogs",
+            params=[("ids", 3), ("ids", 999), ("ids", 1), ("fields", "id,name")],
+        )
+        assert response.status_code == HTTP_OK
+        assert response.json() == {
+            "items": [{"id": 3, "name": "Billy"}, {"id": 1, "name": "Bobbie"}],
+            "missing_ids": [999],
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_expand_owner(self, client: AsyncClient) -> None:
+        response = await client.get(
+            f"/{MODULE_NAME}/dogs/2",
+            params={"expand": "owner", "fields": "id,name"},
+        )
+        assert response.status_code == HTTP_OK
+        assert response.json() == {
+            "id": 2,
+            "name": "Jackee",
+            "owner": {"id": 2, "name": "Bob", "phone": None, "tg_id": 1120},
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_list_filtered(self, client: AsyncClient) -> None:
+        response = await client.get(
+            f"/{MODULE_NAME}/dogs",
+            params={
+                "data": orjson.dumps(
+                    {"owner": {"in": [1, 2, 3]}, "is_active": True, "is_big": False},
+                ).decode(),
+            },
+        )
+        assert response.status_code == HTTP_OK
+        assert [dog["id"] for dog in response.json()["items"]] == [3]
+
+        response = await client.get(
+            f"/{MODULE_NAME}/dogs",
+            params={"data": orjson.dumps({"breed": {"prefix": "Pu"}}).decode()},
+        )
+        assert response.status_code == HTTP_OK
+        assert [dog["name"] for dog in response.json()["items"]] == ["Billy"]
+
+    @pytest.mark.asyncio
+    async def test_get_list_unknown_filter(self, client: AsyncClient) -> None:
+        with pytest.raises(PesopolistException):
+            await client.get(
+                f"/{MODULE_NAME}/dogs",
+                params={"data": orjson.dumps({"password": "secret"}).decode()},
+            )
+
     @pytest.mark.asyncio
     async def test_create(
         self, client: AsyncClient, test_dog: Any, db_session: AsyncSession
@@ -108,6 +180,56 @@ class TestDogs:
             assert dog_data.is_big == test_dog["is_big"]
             assert dog_data.is_active == test_dog["is_active"]
 
+    @pytest.mark.asyncio
+    async def test_create_many_reports_all_errors(
+        self,
+        client: AsyncClient,
+        test_dog: Any,
+        db_session: AsyncSession,
+    ) -> None:
+        count_query = text("SELECT count(*) FROM dogs")
+        dogs_amount = (await db_session.execute(count_query)).scalar()
+
+        payload = [{**test_dog, "owner": "nobody"}, test_dog, {"name": "Rex"}]
+        with pytest.raises(PesopolistException) as exc_info:
+            await client.post(f"/{MODULE_NAME}/dogs/many", json=payload)
+
+        assert exc_info.value.status_code == HTTP_UNPROCESSABLE_ENTITY
+        assert [error["loc"] for error in exc_info.value.description] == [
+            (0, "owner"),
+            (2, "breed"),
+            (2, "owner"),
+        ]
+        assert (await db_session.execute(count_query)).scalar() == dogs_amount
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body", [b'[{"name": "Rex"', b"\xff\xfe"])
+    async def test_create_many_malformed_body(self, client: AsyncClient, body: bytes) -> None:
+        with pytest.raises(PesopolistException) as exc_info:
+            await client.post(f"/{MODULE_NAME}/dogs/many", content=body)
+
+        assert exc_info.value.status_code == HTTP_UNPROCESSABLE_ENTITY
+        # The error middleware renders the description with orjson
+        assert orjson.loads(orjson.dumps(exc_info.value.description))[0]["type"] == "json_invalid"
+
+    @pytest.mark.asyncio
+    async def test_update_many_repeated_id(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+    ) -> None:
+        payload = [
+            {"id": 1, "name": "A"},
+            {"id": 1, "name": "B", "breed": "Pug"},
+            {"id": 1, "name": "C"},
+        ]
+        response = await client.put(f"/{MODULE_NAME}/dogs", json=payload)
+        assert response.status_code == HTTP_OK
+        assert response.json()["updated_ids"] == [1]
+
+        data = (await db_session.execute(text("SELECT name, breed FROM dogs WHERE id = 1"))).one()
+        assert tuple(data) == ("C", "Pug")
+
     @pytest.mark.asyncio
     async def test_update_many(
         self, client: AsyncClient, test_dogs_update: Any, db_session: AsyncSession
@@ -135,6 +257,27 @@ class TestDogs:
             assert dog_data.is_big == update_data["is_big"]
             assert dog_data.is_active == update_data["is_active"]
 
+    @pytest.mark.asyncio
+    async def test_update_many_partial(self, client: AsyncClient, db_session: AsyncSession) -> None:
+        response = await client.put(
+            f"/{MODULE_NAME}/dogs",
+            json=[
+                {"id": 1, "name": "Renamed"},
+                {"id": 2, "is_active": False},
+                {"id": 3, "name": "Renamed"},
+                {"id": 999, "name": "Ghost"},
+            ],
+        )
+        assert response.status_code == HTTP_OK
+        assert response.json() == {"updated_ids": [1, 2, 3], "missing_ids": [999]}
+
+        data = (
+            await db_session.execute(text("SELECT * FROM dogs WHERE id IN (1, 2, 3) ORDER BY id"))
+        ).all()
+
+        assert [dog_data.name for dog_data in data] == ["Renamed", "Jackee", "Renamed"]
+        assert [dog_data.is_active for dog_data in data] == [True, False, True]
+
     @pytest.mark.asyncio
     async def test_update(
         self, client: AsyncClient, test_dog_update: Any, db_session: AsyncSession
@@ -181,6 +324,24 @@ class TestDogs:
 
         assert len(data) == 0
 
+    @pytest.mark.asyncio
+    async def test_delete_many_reports_missing(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+    ) -> None:
+        response = await client.request(
+            method="DELETE",
+            url=f"/{MODULE_NAME}/dogs",
+            json=[4, 999, 3, 4],
+        )
+        assert response.status_code == HTTP_OK
+        assert response.json() == {"deleted_ids": [4, 3], "missing_ids": [999]}
+
+        data = (await db_session.execute(text("SELECT * FROM dogs WHERE id IN (3, 4)"))).all()
+
+        assert len(data) == 0
+
     @pytest.mark.asyncio
     async def test_delete(self, client: AsyncClient, db_session: AsyncSession) -> None:
         id_to_delete = 1
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.config import TEST_DATABASE_URL
+from src.objects.cache import ObjectCache
+from src.objects.invalidation import _PENDING_LOCAL, create_listener, publish
+
+IS_POSTGRESQL = make_url(TEST_DATABASE_URL).get_backend_name() == "postgresql"
+
+
+def other_worker_cache() -> ObjectCache:
+    cache = ObjectCache(maxsize=10, ttl=60)
+    cache.set(("staff_status", 1), {"id": 1}, cache.version("staff_status"))
+    cache.set(("staff_status", 2), {"id": 2}, cache.version("staff_status"))
+    return cache
+
+
+class TestInvalidation:
+    @pytest.mark.asyncio
+    async def test_delivered_on_commit(self, async_engine: AsyncEngine) -> None:
+        cache = other_worker_cache()
+        evicted = asyncio.Event()
+
+        def on_invalidate(table_name: str, ids: list[int]) -> None:
+            cache.evict((table_name, object_id) for object_id in ids)
+            evicted.set()
+
+        listener = create_listener(make_url(TEST_DATABASE_URL))
+        listener.callback = on_invalidate
+        await listener.start()
+        try:
+            async with AsyncSession(async_engine) as session:
+                await publish(session, "staff_status", [1])
+                await session.rollback()
+
+                await publish(session, "staff_status", [2])
+                await session.commit()
+
+            await asyncio.wait_for(evicted.wait(), timeout=5)
+        finally:
+            await listener.stop()
+
+        assert cache.get(("staff_status", 1)) is not None
+        assert cache.get(("staff_status", 2)) is None
+
+    def test_cache_skips_outdated_row(self) -> None:
+        cache = ObjectCache(maxsize=10, ttl=60)
+        version = cache.version("staff_status")
+        # The row is evicted while it is being read
+        cache.evict([("staff_status", 1)])
+        cache.set(("staff_status", 1), {"id": 1}, version)
+        assert cache.get(("staff_status", 1)) is None
+
+    @pytest.mark.asyncio
+    async def test_uncached_tables_not_published(self, async_engine: AsyncEngine) -> None:
+        async with AsyncSession(async_engine) as session:
+            await publish(session, "lessons", [1])
+            await publish(session, "staffs", [1])
+            # Only the write to a cached table is left pending for the commit
+            assert [topic for topic, _ in session.sync_session.info[_PENDING_LOCAL]] == ["staffs"]
+            await session.rollback()
+
+    @pytest.mark.skipif(not IS_POSTGRESQL, reason="needs DATABASE_URL pointing to PostgreSQL")
+    @pytest.mark.asyncio
+    async def test_postgres_chunks_large_payloads(self, async_engine: AsyncEngine) -> None:
+        received: list[int] = []
+        done = asyncio.Event()
+        ids = list(range(1, 2001))
+
+        def on_invalidate(_table_name: str, chunk: list[int]) -> None:
+            received.extend(chunk)
+            if len(received) == len(ids):
+                done.set()
+
+        listener = create_listener(make_url(TEST_DATABASE_URL))
+        listener.callback = on_invalidate
+        await listener.start()
+        try:
+            async with AsyncSession(async_engine) as session:
+                await publish(session, "staffs", ids)
+                await session.commit()
+
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            await listener.stop()
+
+        assert sorted(received) == ids
@@ -1,12 +1,14 @@
 from typing import Any
 
+import orjson
 import pytest
 from httpx import AsyncClient
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.sql import bindparam
 
 from src.config import MODULE_NAME
+from src.objects import LessonDog
 
 from .conftest import HTTP_OK
 
@@ -14,7 +16,7 @@ from .conftest import HTTP_OK
 @pytest.fixture(scope="function")
 def test_lesson_dog() -> dict[str, Any]:
     return {
-        "lesson_id": 1,
+        "lesson_id": 2,
         "dog_id": 1,
     }
 
@@ -50,6 +52,30 @@ class TestLessonDog:
         response = await client.get(f"/{MODULE_NAME}/lesson_dog/1")
         assert response.status_code == HTTP_OK
 
+    @pytest.mark.asyncio
+    async def test_export_ndjson(self, client: AsyncClient) -> None:
+        response = await client.get(f"/{MODULE_NAME}/lesson_dog/export")
+        assert response.status_code == HTTP_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        rows = [orjson.loads(line) for line in response.content.splitlines()]
+        assert rows == [
+            {"id": 1, "dog_id": 1, "lesson_id": 1},
+            {"id": 2, "dog_id": 2, "lesson_id": 1},
+            {"id": 3, "dog_id": 3, "lesson_id": 2},
+            {"id": 4, "dog_id": 4, "lesson_id": 3},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_export_csv(self, client: AsyncClient) -> None:
+        response = await client.get(
+            f"/{MODULE_NAME}/lesson_dog/export",
+            params={"format": "csv", "fields": "lesson_id,dog_id"},
+        )
+        assert response.status_code == HTTP_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.text.splitlines() == ["lesson_id,dog_id", "1,1", "1,2", "2,3", "3,4"]
+
     @pytest.mark.asyncio
     async def test_create(
         self, client: AsyncClient, test_lesson_dog: Any, db_session: AsyncSession
@@ -73,24 +99,80 @@ class TestLessonDog:
     async def test_create_many(
         self, client: AsyncClient, test_lesson_dog: Any, db_session: AsyncSession
     ) -> None:
-        response = await client.post(
-            f"/{MODULE_NAME}/lesson_dog/many", json=[test_lesson_dog, test_lesson_dog]
-        )
+        payload = [test_lesson_dog, {**test_lesson_dog, "dog_id": 2}]
+        response = await client.post(f"/{MODULE_NAME}/lesson_dog/many", json=payload)
         assert response.status_code == HTTP_OK
         assert "created_ids" in response.json()
 
         data = (
             await db_session.execute(
-                text("SELECT * FROM lesson_dog WHERE id IN :id").bindparams(
+                text("SELECT * FROM lesson_dog WHERE id IN :id ORDER BY id").bindparams(
                     bindparam("id", expanding=True)
                 ),
                 {"id": tuple(response.json()["created_ids"])},
             )
         ).all()
 
-        for item in data:
-            assert item.lesson_id == test_lesson_dog["lesson_id"]
-            assert item.dog_id == test_lesson_dog["dog_id"]
+        assert len(data) == len(payload)
+        for item, created in zip(data, payload, strict=True):
+            assert item.lesson_id == created["lesson_id"]
+            assert item.dog_id == created["dog_id"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_load(self, db_session: AsyncSession) -> None:
+        response = await LessonDog.bulk_load(
+            db_session,
+            [{"lesson_id": 3, "dog_id": 1}, {"lesson_id": 3, "dog_id": 2}],
+        )
+        assert response == {"loaded": 2}
+
+        data = (
+            await db_session.execute(
+                text("SELECT dog_id FROM lesson_dog WHERE lesson_id = 3 ORDER BY id"),
+            )
+        ).scalars()
+        assert list(data) == [4, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_import_ndjson_rejected_line(self, client: AsyncClient) -> None:
+        # The second link already exists, only its line fails
+        body = b"\n".join(
+            [
+                b'{"lesson_id": 2, "dog_id": 1}',
+                b'{"lesson_id": 1, "dog_id": 1}',
+                b'{"lesson_id": 2, "dog_id": 2}',
+            ],
+        )
+        response = await client.post(f"/{MODULE_NAME}/lesson_dog/import", content=body)
+        assert response.status_code == HTTP_OK
+
+        report = response.json()
+        assert {key: report[key] for key in ("inserted", "failed", "chunks")} == {
+            "inserted": 2,
+            "failed": 1,
+            "chunks": 1,
+        }
+        assert [error["line"] for error in report["errors"]] == [2]
+
+        response = await client.get(
+            f"/{MODULE_NAME}/lesson_dog",
+            params={"data": orjson.dumps({"lesson_id": 2}).decode()},
+        )
+        assert sorted(item["dog_id"] for item in response.json()["items"]) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_rollback(self, async_engine: AsyncEngine) -> None:
+        # The load is the first statement of the session, a rollback still discards it
+        async with async_sessionmaker(async_engine)() as session:
+            await LessonDog.bulk_load(session, [{"lesson_id": 3, "dog_id": 2}], True)
+            await session.rollback()
+
+            data = (
+                await session.execute(
+                    text("SELECT COUNT(*) FROM lesson_dog WHERE lesson_id = 3"),
+                )
+            ).scalar()
+        assert data == 1
 
     @pytest.mark.asyncio
     async def test_update_many(
@@ -7,14 +7,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import bindparam
 
 from src.config import MODULE_NAME
+from src.exceptions import PesopolistException
 
-from .conftest import HTTP_OK
+from .conftest import HTTP_CONFLICT, HTTP_OK
 
 
 @pytest.fixture(scope="function")
 def test_lesson_staff() -> dict[str, Any]:
     return {
-        "lesson_id": 1,
+        "lesson_id": 2,
         "staff_id": 1,
     }
 
@@ -69,28 +70,44 @@ class TestLessonStaff:
         assert data.lesson_id == test_lesson_staff["lesson_id"]
         assert data.staff_id == test_lesson_staff["staff_id"]
 
+    @pytest.mark.asyncio
+    async def test_create_duplicate(self, client: AsyncClient) -> None:
+        # A repeated link would pay the lesson twice
+        with pytest.raises(PesopolistException) as exc_info:
+            await client.post(f"/{MODULE_NAME}/lesson_staff", json={"lesson_id": 1, "staff_id": 1})
+
+        assert exc_info.value.status_code == HTTP_CONFLICT
+
+    @pytest.mark.asyncio
+    async def test_update_into_duplicate(self, client: AsyncClient) -> None:
+        payload = [{"id": 2, "lesson_id": 1, "staff_id": 1}]
+        with pytest.raises(PesopolistException) as exc_info:
+            await client.put(f"/{MODULE_NAME}/lesson_staff", json=payload)
+
+        assert exc_info.value.status_code == HTTP_CONFLICT
+
     @pytest.mark.asyncio
     async def test_create_many(
         self, client: AsyncClient, test_lesson_staff: Any, db_session: AsyncSession
     ) -> None:
-        response = await client.post(
-            f"/{MODULE_NAME}/lesson_staff/many", json=[test_lesson_staff, test_lesson_staff]
-        )
+        payload = [test_lesson_staff, {**test_lesson_staff, "staff_id": 4}]
+        response = await client.post(f"/{MODULE_NAME}/lesson_staff/many", json=payload)
         assert response.status_code == HTTP_OK
         assert "created_ids" in response.json()
 
         data = (
             await db_session.execute(
-                text("SELECT * FROM lesson_staff WHERE id IN :id").bindparams(
+                text("SELECT * FROM lesson_staff WHERE id IN :id ORDER BY id").bindparams(
                     bindparam("id", expanding=True)
                 ),
                 {"id": tuple(response.json()["created_ids"])},
             )
         ).all()
 
-        for item in data:
-            assert item.lesson_id == test_lesson_staff["lesson_id"]
-            assert item.staff_id == test_lesson_staff["staff_id"]
+        assert len(data) == len(payload)
+        for item, created in zip(data, payload, strict=True):
+            assert item.lesson_id == created["lesson_id"]
+            assert item.staff_id == created["staff_id"]
 
     @pytest.mark.asyncio
     async def test_update_many(
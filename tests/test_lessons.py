@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Any
 
+import orjson
 import pytest
 from httpx import AsyncClient
 from sqlalchemy import text
@@ -8,8 +9,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import bindparam
 
 from src.config import MODULE_NAME
+from src.exceptions import PesopolistException
 
-from .conftest import HTTP_OK
+from .conftest import HTTP_OK, HTTP_UNPROCESSABLE_ENTITY
 
 
 @pytest.fixture(scope="function")
@@ -36,6 +38,70 @@ class TestLessons:
         response = await client.get(f"/{MODULE_NAME}/lessons/1")
         assert response.status_code == HTTP_OK
 
+    @pytest.mark.asyncio
+    async def test_get_list_by_date(self, client: AsyncClient, test_lesson: Any) -> None:
+        response = await client.get(f"/{MODULE_NAME}/lessons", params={"limit": 2})
+        assert response.status_code == HTTP_OK
+        first_page = response.json()
+        assert [lesson["id"] for lesson in first_page["items"]] == [1, 2]
+
+        # Lessons added before the cursor do not shift the next page
+        response = await client.post(
+            f"/{MODULE_NAME}/lessons",
+            json={"is_group": False, "date": "2023-01-01T10:00:00"},
+        )
+        assert response.status_code == HTTP_OK
+        response = await client.post(f"/{MODULE_NAME}/lessons", json=test_lesson)
+        assert response.status_code == HTTP_OK
+        created_id = response.json()["created_id"]
+
+        response = await client.get(
+            f"/{MODULE_NAME}/lessons",
+            params={"limit": 2, "cursor": first_page["next_cursor"]},
+        )
+        assert response.status_code == HTTP_OK
+        second_page = response.json()
+        assert [lesson["id"] for lesson in second_page["items"]] == [3, created_id]
+
+    @pytest.mark.asyncio
+    async def test_get_list_render_db(self, client: AsyncClient) -> None:
+        # On PostgreSQL rows come rendered by json_build_object, elsewhere it falls back
+        params = {"limit": 2, "fields": "id,date"}
+        response = await client.get(f"/{MODULE_NAME}/lessons", params=params)
+        assert response.status_code == HTTP_OK
+        expected = response.json()
+
+        response = await client.get(f"/{MODULE_NAME}/lessons", params={**params, "render": "db"})
+        assert response.status_code == HTTP_OK
+        assert response.json() == expected
+
+    @pytest.mark.asyncio
+    async def test_get_list_date_range(self, client: AsyncClient) -> None:
+        response = await client.get(
+            f"/{MODULE_NAME}/lessons",
+            params={
+                "data": orjson.dumps(
+                    {"date": {"between": ["2023-12-29T15:30:00", "2023-12-29T17:00:00"]}},
+                ).decode(),
+            },
+        )
+        assert response.status_code == HTTP_OK
+        assert [lesson["id"] for lesson in response.json()["items"]] == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_get_expand(self, client: AsyncClient) -> None:
+        response = await client.get(
+            f"/{MODULE_NAME}/lessons",
+            params={"expand": "dogs,staff", "fields": "date", "limit": 2},
+        )
+        assert response.status_code == HTTP_OK
+
+        first, second = response.json()["items"]
+        assert [dog["name"] for dog in first["dogs"]] == ["Bobbie", "Jackee"]
+        assert [staff["name"] for staff in first["staff"]] == ["Alice"]
+        assert [dog["name"] for dog in second["dogs"]] == ["Billy"]
+        assert [staff["name"] for staff in second["staff"]] == ["Bob"]
+
     @pytest.mark.asyncio
     async def test_create(
         self,
@@ -88,6 +154,134 @@ class TestLessons:
                 test_lesson["date"].replace("T", " "),
             )
 
+    @pytest.mark.asyncio
+    async def test_create_many_keeps_order(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+    ) -> None:
+        lessons = [
+            {"is_group": i % 2 == 0, "date": f"2024-02-{i + 1:02d}T10:00:00"} for i in range(5)
+        ]
+        response = await client.post(f"/{MODULE_NAME}/lessons/many", json=lessons)
+        assert response.status_code == HTTP_OK
+
+        created_ids = response.json()["created_ids"]
+        assert len(created_ids) == len(lessons)
+
+        for created_id, lesson in zip(created_ids, lessons, strict=True):
+            data = (
+                await db_session.execute(
+                    text("SELECT * FROM lessons WHERE id = :id"),
+                    {"id": created_id},
+                )
+            ).first()
+
+            assert data is not None
+            assert data.is_group == lesson["is_group"]
+            assert datetime.fromisoformat(str(data.date)) == datetime.fromisoformat(
+                lesson["date"].replace("T", " "),
+            )
+
+    @pytest.mark.asyncio
+    async def test_import_ndjson(self, client: AsyncClient, db_session: AsyncSession) -> None:
+        body = b"\n".join(
+            [
+                b'{"is_group": true, "date": "2024-03-01T10:00:00"}',
+                b'{"is_group": false, "date": "2024-03-02T10:00:00"}',
+                b'{"is_group": false, "date": "not a date"}',
+                b"",
+                b'{"is_group": true, "date": "2024-03-03T10:00:00"}',
+            ],
+        )
+        response = await client.post(
+            f"/{MODULE_NAME}/lessons/import",
+            params={"chunk_size": 2},
+            content=body,
+        )
+        assert response.status_code == HTTP_OK
+
+        report = response.json()
+        assert {key: report[key] for key in ("inserted", "failed", "chunks")} == {
+            "inserted": 3,
+            "failed": 1,
+            "chunks": 2,
+        }
+        assert [error["line"] for error in report["errors"]] == [3]
+
+        data = (
+            await db_session.execute(
+                text("SELECT COUNT(*) FROM lessons WHERE date >= :date"),
+                {"date": "2024-03-01"},
+            )
+        ).scalar()
+        assert data == report["inserted"]
+
+    @pytest.mark.asyncio
+    async def test_import_ndjson_malformed(self, client: AsyncClient) -> None:
+        body = b"\n".join(
+            [
+                b'{"is_group": true, "date": "2024-03-01T10:00:00"}',
+                b'{"is_group": tru',
+                b"\xff\xfe",
+            ],
+        )
+        response = await client.post(f"/{MODULE_NAME}/lessons/import", content=body)
+        assert response.status_code == HTTP_OK
+
+        report = response.json()
+        assert report["inserted"] == 1
+        assert [error["line"] for error in report["errors"]] == [2, 3]
+        assert report["errors"][0]["error"][0]["input"] == '{"is_group": tru'
+
+    @pytest.mark.asyncio
+    async def test_create_with_participants_malformed_body(self, client: AsyncClient) -> None:
+        with pytest.raises(PesopolistException) as exc_info:
+            await client.post(
+                f"/{MODULE_NAME}/lessons/with_participants/many",
+                content=b'[{"is_group": tru',
+            )
+
+        assert exc_info.value.status_code == HTTP_UNPROCESSABLE_ENTITY
+        assert orjson.dumps(exc_info.value.description)
+
+    @pytest.mark.asyncio
+    async def test_create_with_participants(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+    ) -> None:
+        response = await client.post(
+            f"/{MODULE_NAME}/lessons/with_participants/many",
+            json=[
+                {
+                    "is_group": True,
+                    "date": "2024-04-01T10:00:00",
+                    "dog_ids": [1, 2],
+                    "staff_ids": [3],
+                },
+                {"date": "2024-04-02T10:00:00", "dog_ids": [4], "staff_ids": [1, 2]},
+            ],
+        )
+        assert response.status_code == HTTP_OK
+        first_id, second_id = response.json()["created_ids"]
+
+        dogs = (
+            await db_session.execute(
+                text("SELECT lesson_id, dog_id FROM lesson_dog WHERE lesson_id IN (:a, :b)"),
+                {"a": first_id, "b": second_id},
+            )
+        ).all()
+        assert sorted(dogs) == [(first_id, 1), (first_id, 2), (second_id, 4)]
+
+        staff = (
+            await db_session.execute(
+                text("SELECT lesson_id, staff_id FROM lesson_staff WHERE lesson_id IN (:a, :b)"),
+                {"a": first_id, "b": second_id},
+            )
+        ).all()
+        assert sorted(staff) == [(first_id, 3), (second_id, 1), (second_id, 2)]
+
     @pytest.mark.asyncio
     async def test_update_many(
         self,
@@ -190,3 +384,27 @@ class TestLessons:
         ).first()
 
         assert data is None
+
+    @pytest.mark.asyncio
+    async def test_update_partial(self, client: AsyncClient, db_session: AsyncSession) -> None:
+        response = await client.put(f"/{MODULE_NAME}/lessons/2", json={"is_group": True})
+        assert response.status_code == HTTP_OK
+
+        data = (await db_session.execute(text("SELECT * FROM lessons WHERE id = 2"))).first()
+        assert data is not None
+        assert data.is_group
+        assert datetime.fromisoformat(str(data.date)) == datetime(2023, 12, 29, 16)
+
+    @pytest.mark.asyncio
+    async def test_update_invalid(self, client: AsyncClient) -> None:
+        with pytest.raises(PesopolistException) as exc_info:
+            await client.put(
+                f"/{MODULE_NAME}/lessons/2",
+                json={"date": "tomorrow", "teacher": "Alice"},
+            )
+
+        assert exc_info.value.status_code == HTTP_UNPROCESSABLE_ENTITY
+        assert [error["loc"] for error in exc_info.value.description] == [
+            ("date",),
+            ("teacher",),
+        ]
@@ -0,0 +1,141 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from src.db import Base
+from src.db.migrations import MIGRATIONS, migrate
+from src.objects import salary_ledger
+
+
+@pytest_asyncio.fixture(scope="function")
+async def empty_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    await engine.dispose()
+
+
+async def insert_lessons(conn: AsyncConnection) -> None:
+    # Two lessons with a big and a small dog and a group lesson without dogs
+    for statement in (
+        (
+            "INSERT INTO staff_status (id, name, big_dog_price, low_dog_price, group_price) "
+            "VALUES (1, 'trainer', 1000, 800, 400)"
+        ),
+        (
+            "INSERT INTO staffs (id, name, tg_id, status) "
+            "VALUES (1, 'first', 1, 1), (2, 'second', 2, 1)"
+        ),
+        (
+            "INSERT INTO dogs (id, name, breed, owner, is_big, is_active) "
+            "VALUES (1, 'big', 'breed', 1, 1, 1), (2, 'small', 'breed', 1, 0, 1)"
+        ),
+        (
+            "INSERT INTO lessons (id, is_group, date) VALUES "
+            "(1, 0, '2024-03-01 10:00:00'), (2, 0, '2024-03-01 12:00:00'), "
+            "(3, 1, '2024-03-02 10:00:00')"
+        ),
+        "INSERT INTO lesson_dog (lesson_id, dog_id) VALUES (1, 1), (2, 2)",
+        "INSERT INTO lesson_staff (lesson_id, staff_id) VALUES (1, 1), (2, 1), (3, 2)",
+    ):
+        await conn.execute(text(statement))
+
+
+def get_indexes(conn: Connection) -> dict[str, set[tuple[str, tuple[str, ...], bool]]]:
+    inspector = inspect(conn)
+    return {
+        table: {
+            (index["name"], tuple(index["column_names"]), bool(index["unique"]))
+            for index in inspector.get_indexes(table)
+        }
+        for table in Base.metadata.tables
+    }
+
+
+class TestMigrations:
+    @pytest.mark.asyncio
+    async def test_migrate_empty(self, empty_engine: AsyncEngine) -> None:
+        assert await migrate(empty_engine, MIGRATIONS) == [1, 2, 3]
+        assert await migrate(empty_engine, MIGRATIONS) == []
+
+        async with empty_engine.connect() as conn:
+            indexes = await conn.run_sync(get_indexes)
+        # Migrated databases get the same indexes as the models declare
+        for table in Base.metadata.sorted_tables:
+            expected = {
+                (index.name, tuple(column.name for column in index.columns), index.unique)
+                for index in table.indexes
+            }
+            assert expected <= indexes[table.name]
+
+    @pytest.mark.asyncio
+    async def test_migrate_existing(self, empty_engine: AsyncEngine) -> None:
+        # A database created by create_all before the link indexes existed
+        async with empty_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(text("DROP INDEX uq_lesson_staff_lesson_id_staff_id"))
+            await conn.execute(text("DROP INDEX uq_lesson_dog_lesson_id_dog_id"))
+            await conn.execute(
+                text(
+                    "INSERT INTO lesson_staff (lesson_id, staff_id) VALUES (1, 1), (1, 1), (1, 2)",
+                ),
+            )
+            await conn.execute(
+                text("INSERT INTO lesson_dog (lesson_id, dog_id) VALUES (1, 1), (1, 1), (1, 1)"),
+            )
+
+        assert await migrate(empty_engine, MIGRATIONS) == [1, 2, 3]
+
+        async with empty_engine.connect() as conn:
+            links = await conn.execute(text("SELECT id, staff_id FROM lesson_staff ORDER BY id"))
+            assert links.all() == [(1, 1), (3, 2)]
+            links = await conn.execute(text("SELECT id, dog_id FROM lesson_dog ORDER BY id"))
+            assert links.all() == [(1, 1)]
+
+            indexes = await conn.run_sync(get_indexes)
+        assert ("uq_lesson_dog_lesson_id_dog_id", ("lesson_id", "dog_id"), True) in indexes[
+            "lesson_dog"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_migrate_rebuilds_ledger(self, empty_engine: AsyncEngine) -> None:
+        async with empty_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(text("DROP INDEX uq_lesson_staff_lesson_id_staff_id"))
+            await insert_lessons(conn)
+            await conn.execute(text("INSERT INTO lesson_staff (lesson_id, staff_id) VALUES (1, 1)"))
+
+        assert await migrate(empty_engine, MIGRATIONS) == [1, 2, 3]
+
+        async with empty_engine.connect() as conn:
+            # The SQL of the migration gives the same cells as the application
+            assert await salary_ledger.check(conn) == []
+            ledger = await conn.execute(
+                text("SELECT staff_id, lesson_count, amount FROM salary_ledger ORDER BY staff_id"),
+            )
+            assert ledger.all() == [(1, 2, 1800), (2, 1, 0)]
+
+    @pytest.mark.asyncio
+    async def test_deduplicate_before_unique_index(self, empty_engine: AsyncEngine) -> None:
+        # Links repeated after the deduplication, while the unique index doesn't exist yet
+        assert await migrate(empty_engine, MIGRATIONS[:2]) == [1, 2]
+        async with empty_engine.begin() as conn:
+            await conn.execute(text("DROP INDEX uq_lesson_staff_lesson_id_staff_id"))
+            await insert_lessons(conn)
+            await conn.execute(text("INSERT INTO lesson_staff (lesson_id, staff_id) VALUES (1, 1)"))
+
+        assert await migrate(empty_engine, MIGRATIONS) == [3]
+
+        async with empty_engine.connect() as conn:
+            links = await conn.execute(text("SELECT id FROM lesson_staff ORDER BY id"))
+            assert links.scalars().all() == [1, 2, 3]
+            assert await salary_ledger.check(conn) == []
+            indexes = await conn.run_sync(get_indexes)
+        assert (
+            "uq_lesson_staff_lesson_id_staff_id",
+            ("lesson_id", "staff_id"),
+            True,
+        ) in indexes["lesson_staff"]
@@ -1,3 +1,4 @@
+from datetime import date
 from typing import Any
 
 import pytest
@@ -7,6 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import bindparam
 
 from src.config import MODULE_NAME
+from src.objects import LessonDog, salary_ledger
+from src.objects.report_cache import ReportCache
 
 from .conftest import HTTP_OK
 
@@ -54,6 +57,17 @@ class TestStaff:
         response = await client.get(f"/{MODULE_NAME}/staffs/1")
         assert response.status_code == HTTP_OK
 
+    @pytest.mark.asyncio
+    async def test_get_fields(self, client: AsyncClient) -> None:
+        response = await client.get(f"/{MODULE_NAME}/staffs/1", params={"fields": "id,name"})
+        assert response.status_code == HTTP_OK
+        assert response.json() == {"id": 1, "name": "Alice"}
+
+        response = await client.get(f"/{MODULE_NAME}/staffs", params={"fields": "name", "limit": 2})
+        assert response.status_code == HTTP_OK
+        assert response.json()["items"] == [{"name": "Alice"}, {"name": "Bob"}]
+        assert response.json()["next_cursor"]
+
     @pytest.mark.asyncio
     async def test_create(
         self, client: AsyncClient, test_staff: Any, db_session: AsyncSession
@@ -181,3 +195,151 @@ class TestStaff:
         ).first()
 
         assert data is None
+
+    @pytest.mark.asyncio
+    async def test_get_salary(self, client: AsyncClient) -> None:
+        params = {"start_date": "2023-12-01", "end_date": "2023-12-31"}
+        # Group lesson with two dogs at the Junior group price
+        response = await client.get(f"/{MODULE_NAME}/staff/1/salary", params=params)
+        assert response.status_code == HTTP_OK
+        assert response.json() == {"salary": 600}
+
+        response = await client.get(f"/{MODULE_NAME}/staff/2/salary", params=params)
+        assert response.json() == {"salary": 900}
+
+        # Price changes recompute the ledger cells of the staff with that status
+        response = await client.put(f"/{MODULE_NAME}/staff_statuses/2", json={"low_dog_price": 950})
+        assert response.status_code == HTTP_OK
+        response = await client.get(f"/{MODULE_NAME}/staff/2/salary", params=params)
+        assert response.json() == {"salary": 950}
+
+    @pytest.mark.asyncio
+    async def test_get_salary_cached(self, client: AsyncClient) -> None:
+        params = {"start_date": "2023-12-01", "end_date": "2023-12-31"}
+        for staff_id in (1, 2):
+            response = await client.get(f"/{MODULE_NAME}/staff/{staff_id}/salary", params=params)
+            assert response.status_code == HTTP_OK
+
+        response = await client.get(f"/{MODULE_NAME}/stats/cache")
+        before = response.json()["reports"]
+
+        # A new name does not change prices, the size of Billy only affects Bob
+        response = await client.put(f"/{MODULE_NAME}/dogs/3", json={"name": "Bill"})
+        assert response.status_code == HTTP_OK
+        response = await client.put(f"/{MODULE_NAME}/dogs/3", json={"is_big": True})
+        assert response.status_code == HTTP_OK
+
+        response = await client.get(f"/{MODULE_NAME}/stats/cache")
+        after = response.json()["reports"]
+        assert after["invalidations"] == before["invalidations"] + 1
+        assert after["size"] == before["size"] - 1
+
+        response = await client.get(f"/{MODULE_NAME}/staff/2/salary", params=params)
+        assert response.json() == {"salary": 800}
+
+    @pytest.mark.asyncio
+    async def test_salary_ledger(self, client: AsyncClient, db_session: AsyncSession) -> None:
+        params = {"start_date": "2023-12-01", "end_date": "2023-12-31"}
+        # Jake's lesson gets a second dog, moves to Bob's lesson and Bob becomes Senior
+        await LessonDog.bulk_load(db_session, [{"lesson_id": 3, "dog_id": 1}])
+        response = await client.put(f"/{MODULE_NAME}/lesson_staff/3", json={"staff_id": 2})
+        assert response.status_code == HTTP_OK
+        response = await client.put(f"/{MODULE_NAME}/staffs/2", json={"status": 3})
+        assert response.status_code == HTTP_OK
+
+        assert await salary_ledger.check(db_session) == []
+        response = await client.get(f"/{MODULE_NAME}/staff/2/salary", params=params)
+        assert response.json() == {"salary": 1200 + 1200 + 1000}
+        response = await client.get(f"/{MODULE_NAME}/staff/3/salary", params=params)
+        assert response.json() == {"salary": -1}
+
+    @pytest.mark.asyncio
+    async def test_salary_ledger_lesson_without_dogs(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+    ) -> None:
+        response = await client.post(
+            f"/{MODULE_NAME}/lessons/with_participants",
+            json={"date": "2023-12-29T18:00:00", "staff_ids": [4]},
+        )
+        assert response.status_code == HTTP_OK
+
+        assert await salary_ledger.check(db_session) == []
+        rows = await db_session.execute(
+            text("SELECT lesson_count, amount FROM salary_ledger WHERE staff_id = 4"),
+        )
+        assert rows.all() == [(1, 0)]
+
+    @pytest.mark.asyncio
+    async def test_get_salary_report(self, client: AsyncClient) -> None:
+        params = {"start_date": "2023-12-01", "end_date": "2023-12-31", "breakdown": True}
+        response = await client.get(f"/{MODULE_NAME}/reports/salary", params=params)
+        assert response.status_code == HTTP_OK
+        items = {item["staff_id"]: item for item in response.json()["items"]}
+
+        for staff_id in (1, 2, 3):
+            response = await client.get(f"/{MODULE_NAME}/staff/{staff_id}/salary", params=params)
+            assert items[staff_id]["salary"] == response.json()["salary"]
+        assert items[1]["breakdown"]["group"] == {"dogs": 2, "amount": 600}
+        assert items[2]["breakdown"]["low_dog"] == {"dogs": 1, "amount": 900}
+        assert items[4]["lesson_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_salary_report_staff_without_lessons(self, client: AsyncClient) -> None:
+        params = {"start_date": "2023-12-01", "end_date": "2023-12-31"}
+        response = await client.get(f"/{MODULE_NAME}/reports/salary", params=params)
+        items = {item["staff_id"]: item for item in response.json()["items"]}
+        response = await client.get(f"/{MODULE_NAME}/staff/4/salary", params=params)
+
+        # Both endpoints give the same sentinel to staff without lessons in the range
+        assert items[4]["salary"] == response.json()["salary"] == -1
+        assert items[4]["lesson_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_schedule(self, client: AsyncClient) -> None:
+        params = {"date": "2023-12-29"}
+        response = await client.get(f"/{MODULE_NAME}/staff/1/schedule", params=params)
+        assert response.status_code == HTTP_OK
+        data = response.json()
+        assert [lesson["id"] for lesson in data["lessons"]] == [1]
+        dogs = data["lessons"][0]["dogs"]
+        assert [dog["name"] for dog in dogs] == ["Bobbie", "Jackee"]
+        assert dogs[0]["owner"]["id"] == 1
+
+        response = await client.get(
+            f"/{MODULE_NAME}/staff/1/schedule",
+            params={"date": "2023-12-30"},
+        )
+        assert response.json()["lessons"] == []
+
+    @pytest.mark.asyncio
+    async def test_get_schedules(self, client: AsyncClient) -> None:
+        response = await client.get(f"/{MODULE_NAME}/staff/schedule", params={"date": "2023-12-29"})
+        assert response.status_code == HTTP_OK
+        items = response.json()["items"]
+        assert [item["staff_id"] for item in items] == [1, 2, 3]
+        assert [item["lessons"][0]["id"] for item in items] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_ledger_query(self, db_session: AsyncSession) -> None:
+        rows = await db_session.execute(salary_ledger.ledger_query())
+        # Group lessons are paid per attending dog
+        assert {row.staff_id: tuple(row[1:]) for row in rows} == {
+            1: (date(2023, 12, 29), 1, 2, 0, 0, 600),
+            2: (date(2023, 12, 29), 1, 0, 0, 1, 900),
+            3: (date(2023, 12, 29), 1, 0, 0, 1, 1200),
+        }
+
+    def test_report_cache_skips_outdated_value(self) -> None:
+        cache = ReportCache(maxsize=10)
+        key = (1, date(2023, 12, 1), date(2024, 1, 1))
+        version = cache.version(1)
+        # A write of the staff commits while the report is computed
+        cache.invalidate(1, date(2023, 12, 29))
+        cache.set(key, 600, version)
+        assert cache.get(key) is None
+
+        salary = 900
+        cache.set(key, salary, cache.version(1))
+        assert cache.get(key) == salary
@@ -201,3 +201,48 @@ class TestStaffStatuses:
         ).first()
 
         assert data is None
+
+    @pytest.mark.asyncio
+    async def test_get_list_from_snapshot(self, client: AsyncClient) -> None:
+        response = await client.get(
+            f"/{MODULE_NAME}/staff_statuses",
+            params={"limit": 2, "fields": "id,name"},
+        )
+        assert response.status_code == HTTP_OK
+        first_page = response.json()
+        assert first_page["items"] == [{"id": 1, "name": "Junior"}, {"id": 2, "name": "Middle"}]
+
+        response = await client.post(
+            f"/{MODULE_NAME}/staff_statuses",
+            json={"name": "Lead", "big_dog_price": 1, "low_dog_price": 1, "group_price": 1},
+        )
+        created_id = response.json()["created_id"]
+
+        response = await client.get(
+            f"/{MODULE_NAME}/staff_statuses",
+            params={"limit": 2, "fields": "id,name", "cursor": first_page["next_cursor"]},
+        )
+        assert response.json() == {
+            "items": [{"id": 3, "name": "Senior"}, {"id": created_id, "name": "Lead"}],
+            "next_cursor": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_by_ids_from_snapshot(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+    ) -> None:
+        params = [("ids", 2), ("ids", 999), ("ids", 1), ("fields", "id,name")]
+        response = await client.get(f"/{MODULE_NAME}/staff_statuses", params=params)
+        assert response.status_code == HTTP_OK
+        expected = {
+            "items": [{"id": 2, "name": "Middle"}, {"id": 1, "name": "Junior"}],
+            "missing_ids": [999],
+        }
+        assert response.json() == expected
+
+        # A write around the application doesn't reach the snapshot, so no query is made
+        await db_session.execute(text("UPDATE staff_status SET name = 'Changed' WHERE id = 1"))
+        response = await client.get(f"/{MODULE_NAME}/staff_statuses", params=params)
+        assert response.json() == expected
@@ -0,0 +1,24 @@
+import pytest
+from httpx import AsyncClient
+
+from src.config import MODULE_NAME
+
+from .conftest import HTTP_OK
+
+
+class TestStats:
+    @pytest.mark.asyncio
+    async def test_update_statements(self, client: AsyncClient) -> None:
+        response = await client.get(f"/{MODULE_NAME}/stats/statements")
+        assert response.status_code == HTTP_OK
+        before = response.json()["update"]
+
+        # Same column set in any order reuses one statement
+        for data in ({"name": "Rex", "breed": "Pug"}, {"breed": "Pug", "name": "Max"}):
+            response = await client.put(f"/{MODULE_NAME}/dogs/1", json=data)
+            assert response.status_code == HTTP_OK
+
+        response = await client.get(f"/{MODULE_NAME}/stats/statements")
+        after = response.json()["update"]
+        assert after["hits"] + after["misses"] == before["hits"] + before["misses"] + 2
+        assert after["hits"] >= before["hits"] + 1